@@ -1,8 +1,48 @@
+import functools
+import json
 import os
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared HTTP session so provider calls reuse keep-alive connections instead of a fresh TCP/TLS handshake each time.
+# Rate-limit and gateway errors and failed connects are retried with a short backoff (honouring Retry-After).
+# Read timeouts are not: the provider may already be processing the POST, and three more waits would multiply
+# the caller's latency by the full timeout each time.
+_RETRY = Retry(
+    total=3,
+    connect=3,
+    read=0,
+    status=3,
+    backoff_factor=0.2,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+    raise_on_status=False,
+)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=_RETRY))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=_RETRY))
+
+FOLLOW_UP_SYSTEM_PROMPT = (
+    "You are a clinical intake assistant. Ask one concise, empathetic, "
+    "health-related follow-up question based strictly on the patient's last message and prior context. "
+    "Focus on clarifying symptoms, onset/duration, severity, medications, allergies, or red flags. "
+    "Keep it under 30 words and ask only one question."
+)
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You are a medical scribe. Create a clear, structured clinical intake note from the following conversation. "
+    "Sections: Chief Concern, History of Present Illness (symptoms, onset/duration, severity, modifiers), "
+    "Medications, Allergies, Relevant History, Red Flags, Plan/Next Steps. Keep it concise and factual. "
+    "If information isn't provided, mark as 'Not specified'."
+)
+
+# Keyword groups used by the offline mock provider.
+_MOCK_PAIN_WORDS = ("pain", "ache", "hurt")
+_MOCK_FEVER_WORDS = ("fever", "temperature")
 
 # PUBLIC_INTERFACE
 @dataclass
@@ -108,9 +148,9 @@ class AIClient:
             # Generate a basic follow-up based on keywords
             follow = "Could you tell me more about your symptoms, their duration, severity, and any medications you are taking?"
             low = last_user.lower()
-            if any(k in low for k in ["pain", "ache", "hurt"]):
+            if any(k in low for k in _MOCK_PAIN_WORDS):
                 follow = "On a scale from 1-10, how severe is your pain, and when did it start?"
-            elif any(k in low for k in ["fever", "temperature"]):
+            elif any(k in low for k in _MOCK_FEVER_WORDS):
                 follow = "What is your current temperature and how long have you had a fever?"
             elif "cough" in low:
                 follow = "Is your cough dry or productive, and are there any triggers or times it worsens?"
@@ -118,31 +158,27 @@ class AIClient:
 
         url = self._endpoint()
         headers = self._headers()
-        resp = requests.post(url, headers=headers, json=payload, timeout=60)
+        resp = _SESSION.post(url, headers=headers, json=payload, timeout=60)
         if resp.status_code >= 400:
             raise AIClientError(f"AI provider error {resp.status_code}: {resp.text}")
         return resp.json()
 
+    def _follow_up_payload(self, dialogue: List[dict]) -> dict:
+        return {
+            "model": self.cfg.model,
+            "messages": [{"role": "system", "content": FOLLOW_UP_SYSTEM_PROMPT}] + dialogue,
+            "temperature": 0.4,
+            "n": 1,
+            "max_tokens": 120,
+        }
+
     # PUBLIC_INTERFACE
     def ask_follow_up(self, dialogue: List[dict]) -> str:
         """Return a single follow-up question based on conversation context.
 
         dialogue: list of {"role": "user"|"assistant", "content": "..."}
         """
-        system_prompt = (
-            "You are a clinical intake assistant. Ask one concise, empathetic, "
-            "health-related follow-up question based strictly on the patient's last message and prior context. "
-            "Focus on clarifying symptoms, onset/duration, severity, medications, allergies, or red flags. "
-            "Keep it under 30 words and ask only one question."
-        )
-        payload = {
-            "model": self.cfg.model,
-            "messages": [{"role": "system", "content": system_prompt}] + dialogue,
-            "temperature": 0.4,
-            "n": 1,
-            "max_tokens": 120,
-        }
-        data = self._post(payload)
+        data = self._post(self._follow_up_payload(dialogue))
         # OpenAI compatible response
         content = (
             data.get("choices", [{}])[0]
@@ -152,31 +188,73 @@ class AIClient:
         return content.strip()
 
     # PUBLIC_INTERFACE
-    def summarize_dialogue(self, dialogue: List[dict], patient_id: str) -> str:
-        """Generate a concise clinical note from a conversation."""
-        system_prompt = (
-            "You are a medical scribe. Create a clear, structured clinical intake note from the following conversation. "
-            "Sections: Chief Concern, History of Present Illness (symptoms, onset/duration, severity, modifiers), "
-            "Medications, Allergies, Relevant History, Red Flags, Plan/Next Steps. Keep it concise and factual. "
-            "If information isn't provided, mark as 'Not specified'."
-        )
+    def stream_follow_up(self, dialogue: List[dict]) -> Iterator[str]:
+        """Yield the follow-up question in text deltas as the provider produces them.
+
+        The mock provider yields its whole answer as a single delta.
+        """
+        if self.cfg.provider == "mock":
+            yield self.ask_follow_up(dialogue)
+            return
+        yield from self._stream(self._follow_up_payload(dialogue))
+
+    def _summary_payload(self, dialogue: List[dict], patient_id: str) -> dict:
         user_prompt = f"Patient ID: {patient_id}\nConversation:\n" + "\n".join(
             f"{m['role'].capitalize()}: {m['content']}" for m in dialogue
         )
-        payload = {
+        return {
             "model": self.cfg.model,
             "messages": [
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
                 {"role": "user", "content": user_prompt},
             ],
             "temperature": 0.3,
             "n": 1,
             "max_tokens": 800,
         }
-        data = self._post(payload)
+
+    # PUBLIC_INTERFACE
+    def summarize_dialogue(self, dialogue: List[dict], patient_id: str) -> str:
+        """Generate a concise clinical note from a conversation."""
+        data = self._post(self._summary_payload(dialogue, patient_id))
         content = (
             data.get("choices", [{}])[0]
             .get("message", {})
             .get("content", "")
         )
         return content.strip()
+
+    # PUBLIC_INTERFACE
+    def stream_summary(self, dialogue: List[dict], patient_id: str) -> Iterator[str]:
+        """Yield the clinical note summary in text deltas as the provider produces them.
+
+        The mock provider yields its whole answer as a single delta.
+        """
+        if self.cfg.provider == "mock":
+            yield self.summarize_dialogue(dialogue, patient_id)
+            return
+        yield from self._stream(self._summary_payload(dialogue, patient_id))
+
+    def _stream(self, payload: dict) -> Iterator[str]:
+        # OpenAI-compatible "stream": true mode: server-sent "data:" lines of deltas, ending with "[DONE]".
+        payload = {**payload, "stream": True}
+        with _SESSION.post(self._endpoint(), headers=self._headers(), json=payload, timeout=60, stream=True) as resp:
+            if resp.status_code >= 400:
+                raise AIClientError(f"AI provider error {resp.status_code}: {resp.text}")
+            for line in resp.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                delta = (choices[0].get("delta") or {}).get("content")
+                if delta:
+                    yield delta
+
+
+# PUBLIC_INTERFACE
+@functools.lru_cache(maxsize=None)
+def get_shared_client() -> AIClient:
+    """Return a process-wide AIClient built from environment configuration on first use."""
+    return AIClient()
@@ -1,6 +1,7 @@
 import json
 import os
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.test import RequestFactory
 from drf_yasg import openapi
@@ -9,6 +10,8 @@ from rest_framework.permissions import AllowAny
 
 class Command(BaseCommand):
     def handle(self, *args, **options):
+        if not settings.EXPOSE_SCHEMA:
+            self.stderr.write("EXPOSE_SCHEMA is off; views carry no swagger metadata, so the schema will be sparse.")
         factory = RequestFactory()
         django_request = factory.get('/api/?format=openapi')
 
@@ -28,9 +31,8 @@ class Command(BaseCommand):
 
         openapi_schema = json.loads(response.content.decode())
 
-        output_dir = "interfaces"
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, "openapi.json")
+        output_path = settings.OPENAPI_SCHEMA_PATH
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
         with open(output_path, "w") as f:
             json.dump(openapi_schema, f, indent=2)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-15 22:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='message',
+            options={'ordering': ['timestamp', 'id']},
+        ),
+    ]
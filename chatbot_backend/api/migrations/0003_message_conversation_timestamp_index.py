@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-15 22:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_message_ordering_tiebreak'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', 'timestamp'], name='msg_convo_timestamp_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-15 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_summaryjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summaryjob',
+            name='kind',
+            field=models.CharField(choices=[('summary', 'Generate and save summary'), ('save', 'Save note text')], default='summary', max_length=16),
+        ),
+    ]
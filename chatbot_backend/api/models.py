@@ -31,7 +31,38 @@ class Message(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ["timestamp"]
+        # id breaks ties between messages inserted in the same bulk_create call.
+        ordering = ["timestamp", "id"]
+        # Serves conversation.messages in order straight from the index instead of filtering then sorting.
+        indexes = [models.Index(fields=["conversation", "timestamp"], name="msg_convo_timestamp_idx")]
 
     def __str__(self) -> str:
         return f"Message({self.id}) {self.sender}"
+
+
+class SummaryJob(models.Model):
+    """Tracks a background note save: a generate-and-save summary or a plain save of supplied note text."""
+    KIND_CHOICES = (
+        ("summary", "Generate and save summary"),
+        ("save", "Save note text"),
+    )
+    STATUS_CHOICES = (
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    conversation = models.ForeignKey(Conversation, related_name="summary_jobs", on_delete=models.CASCADE)
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES, default="summary")
+    filename = models.CharField(max_length=255)
+    note_title = models.CharField(max_length=255, blank=True, default="")
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default="pending")
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"SummaryJob({self.id}) {self.status}"
@@ -0,0 +1,29 @@
+import orjson
+from django.utils.http import parse_header_parameters
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# DRF's encoder covers the types orjson does not serialize natively (lazy strings, Decimal, QuerySet, ...).
+_FALLBACK_ENCODER = JSONEncoder()
+
+
+# PUBLIC_INTERFACE
+class ORJSONRenderer(BaseRenderer):
+    """JSON renderer backed by orjson.
+
+    Produces the same JSON as DRF's JSONRenderer for this API's payloads (UTC datetimes end in "Z", UUIDs are
+    strings) while encoding natively instead of through the stdlib json module.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data to JSON bytes; honours an `indent` media type parameter (e.g. from the browsable API)."""
+        if data is None:
+            return b""
+        option = orjson.OPT_UTC_Z
+        if accepted_media_type and parse_header_parameters(accepted_media_type)[1].get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_FALLBACK_ENCODER.default, option=option)
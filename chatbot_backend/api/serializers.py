@@ -1,5 +1,11 @@
+import re
+import uuid
+from collections.abc import Mapping
+
 from rest_framework import serializers
 
+_SENDER_CHOICES = ("patient", "bot")
+
 
 # PUBLIC_INTERFACE
 class StartConversationSerializer(serializers.Serializer):
@@ -19,7 +25,7 @@ class MessageSerializer(serializers.Serializer):
     - If the conversation does not exist and patient_id is not provided, the request will be rejected.
     """
     conversation_id = serializers.UUIDField(help_text="Conversation ID")
-    sender = serializers.ChoiceField(choices=["patient", "bot"], help_text="Message sender")
+    sender = serializers.ChoiceField(choices=list(_SENDER_CHOICES), help_text="Message sender")
     text = serializers.CharField(help_text="Message content")
     patient_id = serializers.CharField(required=False, allow_blank=False, help_text="Patient ID to create a conversation if conversation_id is not found")
 
@@ -51,7 +57,12 @@ class LocalSaveRequestSerializer(serializers.Serializer):
     """Serializer for saving a note to local disk."""
     conversation_id = serializers.UUIDField(help_text="Conversation ID")
     note_text = serializers.CharField(help_text="The note text to save as .txt")
-    filename = serializers.CharField(help_text="Desired filename, .txt will be enforced if not present")
+    filename = serializers.CharField(max_length=255, help_text="Desired filename, .txt will be enforced if not present")
+    background = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Return 202 with a job_id immediately and write the file in the background",
+    )
 
 
 # PUBLIC_INTERFACE
@@ -81,5 +92,120 @@ class NextFollowUpResponseSerializer(serializers.Serializer):
 class GenerateAndSaveSummaryRequestSerializer(serializers.Serializer):
     """Request serializer to generate and save an AI summary to OneDrive path."""
     conversation_id = serializers.UUIDField(help_text="Conversation ID")
-    filename = serializers.CharField(help_text="Desired filename for the note (.txt enforced)")
-    note_title = serializers.CharField(required=False, allow_blank=True, default="", help_text="Optional title for the note")
+    filename = serializers.CharField(max_length=255, help_text="Desired filename for the note (.txt enforced)")
+    note_title = serializers.CharField(max_length=255, required=False, allow_blank=True, default="", help_text="Optional title for the note")
+    background = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Return 202 with a job_id immediately and generate/save in the background",
+    )
+
+
+# PUBLIC_INTERFACE
+class SummaryJobStatusSerializer(serializers.Serializer):
+    """Serializer for background note job status."""
+    job_id = serializers.UUIDField()
+    conversation_id = serializers.UUIDField()
+    kind = serializers.CharField()
+    status = serializers.CharField()
+    result = serializers.JSONField(allow_null=True)
+    error = serializers.CharField(allow_blank=True)
+    created_at = serializers.DateTimeField()
+    updated_at = serializers.DateTimeField()
+
+
+# Hand-written validators for the hot send-message and follow-up endpoints. They apply the same rules and
+# produce the same error shape as the serializers above without DRF's per-field machinery; the serializer
+# classes remain the documented request schema.
+
+_SURROGATE_RE = re.compile("[\ud800-\udfff]")
+
+
+def _required(data, name: str, errors: dict):
+    if name not in data:
+        errors[name] = [serializers.ErrorDetail("This field is required.", code="required")]
+        return None
+    value = data[name]
+    if value is None:
+        errors[name] = [serializers.ErrorDetail("This field may not be null.", code="null")]
+    return value
+
+
+def _uuid_value(data, name: str, errors: dict) -> uuid.UUID | None:
+    value = _required(data, name, errors)
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return uuid.UUID(int=value)
+        if isinstance(value, str):
+            return uuid.UUID(hex=value)
+    except ValueError:
+        pass
+    errors[name] = [serializers.ErrorDetail("Must be a valid UUID.", code="invalid")]
+    return None
+
+
+def _char_value(value, name: str, errors: dict) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        errors[name] = [serializers.ErrorDetail("Not a valid string.", code="invalid")]
+        return None
+    value = str(value).strip()
+    if not value:
+        errors[name] = [serializers.ErrorDetail("This field may not be blank.", code="blank")]
+        return None
+    # CharField's default validators: NUL bytes and lone surrogates cannot be stored or encoded.
+    if "\x00" in value:
+        errors[name] = [
+            serializers.ErrorDetail("Null characters are not allowed.", code="null_characters_not_allowed")
+        ]
+        return None
+    surrogate = _SURROGATE_RE.search(value)
+    if surrogate:
+        errors[name] = [serializers.ErrorDetail(
+            f"Surrogate characters are not allowed: U+{ord(surrogate.group()):X}.",
+            code="surrogate_characters_not_allowed",
+        )]
+        return None
+    return value
+
+
+def _expect_mapping(data) -> None:
+    if not isinstance(data, Mapping):
+        raise serializers.ValidationError(
+            {"non_field_errors": [f"Invalid data. Expected a dictionary, but got {type(data).__name__}."]}
+        )
+
+
+# PUBLIC_INTERFACE
+def validate_message_payload(data) -> dict:
+    """Validate a send-message body the way MessageSerializer does and return its validated_data.
+
+    Raises serializers.ValidationError with the same per-field details as MessageSerializer.errors.
+    """
+    _expect_mapping(data)
+    errors: dict = {}
+    validated = {"conversation_id": _uuid_value(data, "conversation_id", errors)}
+    sender = _required(data, "sender", errors)
+    if sender is not None and str(sender) not in _SENDER_CHOICES:
+        errors["sender"] = [serializers.ErrorDetail(f'"{sender}" is not a valid choice.', code="invalid_choice")]
+    validated["sender"] = sender
+    validated["text"] = _char_value(_required(data, "text", errors), "text", errors)
+    if "patient_id" in data:
+        validated["patient_id"] = _char_value(_required(data, "patient_id", errors), "patient_id", errors)
+    if errors:
+        raise serializers.ValidationError(errors)
+    return validated
+
+
+# PUBLIC_INTERFACE
+def validate_follow_up_payload(data) -> dict:
+    """Validate a next-follow-up body the way NextFollowUpRequestSerializer does and return its validated_data."""
+    _expect_mapping(data)
+    errors: dict = {}
+    validated = {"conversation_id": _uuid_value(data, "conversation_id", errors)}
+    if errors:
+        raise serializers.ValidationError(errors)
+    return validated
@@ -1,23 +1,114 @@
+import asyncio
+import codecs
+import hashlib
+import itertools
+import json
+import logging
 import os
+import re
+import stat
+import tempfile
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Tuple
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Tuple
 
+from django.core.cache import cache
+from django.db import connections, transaction
 from django.utils import timezone
 
-from .models import Conversation, Message
-from .ai import AIClient
+from .models import Conversation, Message, SummaryJob
+from .ai import AIClient, get_shared_client
+
+logger = logging.getLogger(__name__)
+
+# Keyword categories for the heuristic note fallback, scanned in one pass per line. Keywords match substrings
+# (e.g. "allerg" covers "allergy"/"allergic") case-insensitively. The zero-width lookahead reports every
+# keyword start, even where keywords overlap, and lastgroup names the category; no keyword contains another
+# category's keyword, so nothing is shadowed.
+_CATEGORY_RE = re.compile(
+    r"(?=(?P<symptoms>pain|fever|cough|nausea|headache|dizzy|rash|fatigue|sore)"
+    r"|(?P<duration>week|day|month)"
+    r"|(?P<severity>mild|moderate|severe|worse|improving)"
+    r"|(?P<medications>med|drug|pill|ibuprofen|acetaminophen|paracetamol|antibiotic)"
+    r"|(?P<allergies>allerg)"
+    r"|(?P<concerns>concern|worried|afraid))",
+    re.IGNORECASE,
+)
+_NOT_SPECIFIED = ("Not specified",)
+_NOT_AVAILABLE = ("Not available",)
+
+
+# PUBLIC_INTERFACE
+def classify_patient_lines(lines: Iterable[str]) -> dict:
+    """Bucket patient lines by clinical category for the heuristic note.
+
+    Returns lists of matching lines for "symptoms", "medications", "allergies" and "concerns", and the
+    first matching line (or None) for "duration" and "severity". A line may land in several categories.
+    """
+    found = {"symptoms": [], "medications": [], "allergies": [], "concerns": [], "duration": None, "severity": None}
+    for line in lines:
+        categories = {m.lastgroup for m in _CATEGORY_RE.finditer(line)}
+        for category in categories:
+            bucket = found[category]
+            if bucket is None:
+                found[category] = line
+            elif isinstance(bucket, list):
+                bucket.append(line)
+    return found
+
+
+# Seconds an AI summary stays memoized for an identical dialogue.
+SUMMARY_CACHE_TTL = 3600
+# Message.sender -> chat role sent to the AI provider.
+_ROLE_MAP = {"patient": "user", "bot": "assistant"}
+# Seconds a conversation's built dialogue stays cached; the key includes updated_at, so appends invalidate it.
+DIALOGUE_CACHE_TTL = 300
+
+
+# PUBLIC_INTERFACE
+def build_dialogue(conversation: Conversation) -> List[dict]:
+    """Return the conversation as chat messages: [{"role": "user"|"assistant", "content": text}, ...].
+
+    The result is cached per (conversation id, updated_at) so note generation and follow-up calls on the
+    same conversation state share one build. Rows are read with values_list to skip Message instantiation.
+    """
+    key = f"dlg:{conversation.id}:{conversation.updated_at.timestamp()}"
+    dialogue = cache.get(key)
+    if dialogue is None:
+        dialogue = [
+            {"role": _ROLE_MAP.get(sender, "assistant"), "content": text}
+            for sender, text in conversation.messages.values_list("sender", "text")
+        ]
+        cache.set(key, dialogue, DIALOGUE_CACHE_TTL)
+    return dialogue
+
 
 # PUBLIC_INTERFACE
 @dataclass
 class ConversationManager:
-    """Manage conversations and messages."""
+    """Manage conversations and messages.
+
+    Holds no state, so one instance can be shared by every request thread.
+    """
 
     # PUBLIC_INTERFACE
-    def start_conversation(self, patient_id: str, metadata: dict | None = None) -> Conversation:
-        """Start a new conversation for a patient."""
-        convo = Conversation.objects.create(patient_id=patient_id, metadata=metadata or {})
+    def start_conversation(
+        self, patient_id: str, metadata: dict | None = None, messages: List[Tuple[str, str]] | None = None
+    ) -> Conversation:
+        """Start a new conversation for a patient.
+        messages: optional initial list of (sender, text), inserted in the same transaction
+        """
+        if not messages:
+            return Conversation.objects.create(patient_id=patient_id, metadata=metadata or {})
+        with transaction.atomic():
+            convo = Conversation.objects.create(patient_id=patient_id, metadata=metadata or {})
+            Message.objects.bulk_create(
+                [Message(conversation=convo, sender=sender, text=text) for sender, text in messages],
+                batch_size=500,
+            )
         return convo
 
     # PUBLIC_INTERFACE
@@ -25,25 +116,42 @@ class ConversationManager:
         """Append messages to an existing conversation.
         messages: list of (sender, text)
         """
-        convo = Conversation.objects.get(id=conversation_id)
-        for sender, text in messages:
-            Message.objects.create(conversation=convo, sender=sender, text=text)
-        convo.updated_at = timezone.now()
-        convo.save(update_fields=["updated_at"])
+        with transaction.atomic():
+            # Only updated_at is written back, so load just the key columns and skip the metadata JSON.
+            convo = Conversation.objects.only("id", "updated_at").get(id=conversation_id)
+            Message.objects.bulk_create(
+                [Message(conversation=convo, sender=sender, text=text) for sender, text in messages],
+                batch_size=500,
+            )
+            now = timezone.now()
+            Conversation.objects.filter(id=convo.id).update(updated_at=now)
+            convo.updated_at = now
         return convo
 
     # PUBLIC_INTERFACE
-    def get_conversation(self, conversation_id: uuid.UUID) -> Conversation:
-        """Retrieve a conversation."""
-        return Conversation.objects.get(id=conversation_id)
+    def get_conversation(self, conversation_id: uuid.UUID, fields: Iterable[str] | None = None) -> Conversation:
+        """Retrieve a conversation.
+        fields: optional columns to load (.only()); others, such as the metadata JSON, load lazily if touched
+        """
+        queryset = Conversation.objects.only(*fields) if fields else Conversation.objects
+        return queryset.get(id=conversation_id)
 
 
 # PUBLIC_INTERFACE
 class NoteGenerator:
-    """Generate a disease note using AI with a rule-based fallback."""
+    """Generate a disease note using AI with a rule-based fallback.
+
+    Safe to share across threads: the only attribute is the AI client, set once in __init__, and summaries
+    are memoized in Django's cache rather than on the instance.
+    """
 
     def __init__(self, ai: AIClient | None = None) -> None:
-        self.ai = ai or AIClient()
+        self.ai = ai or get_shared_client()
+
+    # PUBLIC_INTERFACE
+    def note_title(self, conversation: Conversation, note_title: str = "") -> str:
+        """Return the requested title, or the default title for the conversation's patient."""
+        return note_title.strip() or f"Disease Note for Patient {conversation.patient_id}"
 
     # PUBLIC_INTERFACE
     def generate_note(self, conversation: Conversation, note_title: str = "") -> Tuple[str, str]:
@@ -51,77 +159,141 @@ class NoteGenerator:
 
         Returns (title, text).
         """
-        messages = conversation.messages.all()
-        dialogue = []
-        for m in messages:
-            role = "user" if m.sender == "patient" else "assistant"
-            dialogue.append({"role": role, "content": m.text})
+        title = self.note_title(conversation, note_title)
+        return title, "\n".join(self.iter_note_lines(conversation, title))
 
-        title = note_title.strip() or f"Disease Note for Patient {conversation.patient_id}"
+    # PUBLIC_INTERFACE
+    def iter_note_lines(self, conversation: Conversation, title: str) -> Iterator[str]:
+        """Yield the note's lines (without newline terminators) for the given title.
 
+        Callers that write the note somewhere (e.g. LocalNoteStorage.save_lines) can consume this directly
+        instead of holding both a list of lines and the joined text. The AI summary is yielded as one chunk.
+        """
+        dialogue = build_dialogue(conversation)
         try:
-            ai_text = self.ai.summarize_dialogue(dialogue=dialogue, patient_id=conversation.patient_id)
-            text = f"Title: {title}\nConversation ID: {conversation.id}\nPatient ID: {conversation.patient_id}\n\n{ai_text}"
-            return title, text
+            ai_text = self._summarize(dialogue, conversation.patient_id)
         except Exception:
+            ai_text = ""
+        if not ai_text:
             # Fallback to prior heuristic composition
-            patient_lines = [m.text.strip() for m in messages if m.sender == "patient" and m.text.strip()]
-            bot_lines = [m.text.strip() for m in messages if m.sender == "bot" and m.text.strip()]
-
-            symptoms = []
-            duration = None
-            severity = None
-            meds = []
-            allergies = []
-            concerns = []
-
-            for line in patient_lines:
-                low = line.lower()
-                if any(k in low for k in ["pain", "fever", "cough", "nausea", "headache", "dizzy", "rash", "fatigue", "sore"]):
-                    symptoms.append(line)
-                if "week" in low or "day" in low or "month" in low:
-                    duration = line if duration is None else duration
-                if any(k in low for k in ["mild", "moderate", "severe", "worse", "improving"]):
-                    severity = line if severity is None else severity
-                if any(k in low for k in ["med", "medicine", "drug", "pill", "ibuprofen", "acetaminophen", "paracetamol", "antibiotic"]):
-                    meds.append(line)
-                if "allerg" in low:
-                    allergies.append(line)
-                if any(k in low for k in ["concern", "worried", "afraid"]):
-                    concerns.append(line)
-
-            lines = [
-                f"Title: {title}",
-                f"Conversation ID: {conversation.id}",
-                f"Patient ID: {conversation.patient_id}",
-                f"Created: {conversation.created_at.isoformat()}",
-                f"Updated: {conversation.updated_at.isoformat()}",
-                "",
-                "Chief Concerns:",
-                *([f"- {c}" for c in concerns] or ["- Not specified"]),
-                "",
-                "Reported Symptoms:",
-                *([f"- {s}" for s in symptoms] or ["- Not specified"]),
-                "",
-                "Duration:",
-                f"- {duration or 'Not specified'}",
-                "",
-                "Severity:",
-                f"- {severity or 'Not specified'}",
-                "",
-                "Medications:",
-                *([f"- {m}" for m in meds] or ["- Not specified"]),
-                "",
-                "Allergies:",
-                *([f"- {a}" for a in allergies] or ["- Not specified"]),
-                "",
-                "Context (last bot prompts):",
-                *([f"- {b}" for b in bot_lines[-3:]] or ["- Not available"]),
-                "",
-                "Generated At:",
-                f"- {datetime.utcnow().isoformat()}Z",
-            ]
-            return title, "\n".join(lines)
+            yield from self._heuristic_lines(conversation, title, dialogue)
+            return
+        yield f"Title: {title}"
+        yield f"Conversation ID: {conversation.id}"
+        yield f"Patient ID: {conversation.patient_id}"
+        yield ""
+        yield ai_text
+
+    # PUBLIC_INTERFACE
+    def stream_note(self, conversation: Conversation, title: str) -> Iterator[str]:
+        """Yield the note text in chunks while the AI summary streams in, in the same layout as generate_note.
+
+        A memoized summary is yielded whole. If the AI call fails before producing any text, the heuristic
+        note is yielded instead; a failure after text has been sent propagates to the caller.
+        """
+        dialogue = build_dialogue(conversation)
+        header = f"Title: {title}\nConversation ID: {conversation.id}\nPatient ID: {conversation.patient_id}\n\n"
+        key = self._summary_key(dialogue, conversation.patient_id)
+        ai_text = cache.get(key)
+        if ai_text is not None:
+            yield header + ai_text
+            return
+        deltas = iter(self.ai.stream_summary(dialogue=dialogue, patient_id=conversation.patient_id))
+        first = ""
+        try:
+            # Hold the header back until the provider has answered, so a failed or empty call can still fall back.
+            for delta in deltas:
+                first = delta.lstrip()
+                if first:
+                    break
+        except Exception:
+            first = ""
+        if not first:
+            yield "\n".join(self._heuristic_lines(conversation, title, dialogue))
+            return
+        # Trailing whitespace is held back until more text follows, so the streamed text matches the stripped
+        # summary that generate_note and the cache return.
+        parts = []
+        prefix, pending = header, ""
+        for delta in itertools.chain((first,), deltas):
+            text = pending + delta
+            body = text.rstrip()
+            pending = text[len(body):]
+            if body:
+                parts.append(body)
+                yield prefix + body
+                prefix = ""
+        cache.set(key, "".join(parts), SUMMARY_CACHE_TTL)
+
+    def _heuristic_lines(self, conversation: Conversation, title: str, dialogue: List[dict]) -> Iterator[str]:
+        """Yield a rule-based note built from keyword matches on the patient's messages."""
+        # "user" is the patient, "assistant" the bot
+        patient_lines = []
+        bot_lines = []
+        for d in dialogue:
+            line = d["content"].strip()
+            if line:
+                (patient_lines if d["role"] == "user" else bot_lines).append(line)
+        found = classify_patient_lines(patient_lines)
+        generated_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+        yield f"Title: {title}"
+        yield f"Conversation ID: {conversation.id}"
+        yield f"Patient ID: {conversation.patient_id}"
+        yield f"Created: {conversation.created_at.isoformat()}"
+        yield f"Updated: {conversation.updated_at.isoformat()}"
+        for heading, items, empty in (
+            ("Chief Concerns:", found["concerns"], _NOT_SPECIFIED),
+            ("Reported Symptoms:", found["symptoms"], _NOT_SPECIFIED),
+            ("Duration:", (found["duration"],) if found["duration"] else (), _NOT_SPECIFIED),
+            ("Severity:", (found["severity"],) if found["severity"] else (), _NOT_SPECIFIED),
+            ("Medications:", found["medications"], _NOT_SPECIFIED),
+            ("Allergies:", found["allergies"], _NOT_SPECIFIED),
+            ("Context (last bot prompts):", bot_lines[-3:], _NOT_AVAILABLE),
+            ("Generated At:", (generated_at,), _NOT_SPECIFIED),
+        ):
+            yield ""
+            yield heading
+            for item in items or empty:
+                yield "- " + item
+
+    @staticmethod
+    def _summary_key(dialogue: List[dict], patient_id: str) -> str:
+        payload = json.dumps([patient_id, dialogue], separators=(",", ":"))
+        return "sumd:" + hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _summarize(self, dialogue: List[dict], patient_id: str) -> str:
+        """Call the AI summarizer, memoized in Django's cache on an exact hash of the prompt inputs."""
+        key = self._summary_key(dialogue, patient_id)
+        ai_text = cache.get(key)
+        if ai_text is None:
+            ai_text = self.ai.summarize_dialogue(dialogue=dialogue, patient_id=patient_id)
+            # An empty answer is not memoized, so the next request asks the provider again.
+            if ai_text:
+                cache.set(key, ai_text, SUMMARY_CACHE_TTL)
+        return ai_text
+
+
+# Local note writes encode this many characters at a time into a file buffer of _WRITE_BUFFER_BYTES.
+_WRITE_CHUNK_CHARS = 64 * 1024
+_WRITE_BUFFER_BYTES = 1024 * 1024
+# Threads for async note writes and background summary jobs (LocalNoteStorage.asave_text_file, SummaryJobRunner).
+_IO_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="note-io")
+# fdatasync skips flushing unchanged file metadata; Windows and macOS only provide fsync.
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+# Process umask, read once at import (os.umask can only be queried by setting it). mkstemp creates files
+# with mode 0600; saved notes get the mode a plain open() would have given them instead.
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+
+
+def _write_encoded(f: BinaryIO, chunks: Iterable[str]) -> int:
+    """Encode text chunks to UTF-8 incrementally into f; returns the number of bytes written."""
+    encoder = codecs.getincrementalencoder("utf-8")()
+    written = 0
+    for chunk in chunks:
+        written += f.write(encoder.encode(chunk))
+    return written + f.write(encoder.encode("", final=True))
 
 
 # PUBLIC_INTERFACE
@@ -137,8 +309,16 @@ class LocalNoteStorage:
     Uses environment variables for flexibility:
     - ONEDRIVE_SAVE_DIR: Preferred path to save notes (e.g., OneDrive synced directory)
       Fallback is C:\\Nilesh_TATA\\Prescription for backward compatibility.
+
+    Instances may be shared across threads: base_dir is fixed after construction, the class-level directory
+    set is guarded by _VERIFIED_LOCK, and each save writes its own uniquely named temporary file before
+    os.replace swaps it in, so concurrent saves of the same note leave one complete version (the last rename wins).
     """
 
+    # Directories already created in this process; saves skip the makedirs syscall for them.
+    _VERIFIED_DIRS: set = set()
+    _VERIFIED_LOCK = threading.Lock()
+
     def __init__(self, base_dir: str | None = None) -> None:
         """
         base_dir: target directory to save notes. If None, uses env ONEDRIVE_SAVE_DIR or legacy path.
@@ -151,12 +331,107 @@ class LocalNoteStorage:
         """
         Save the given content as a .txt file in the base directory.
 
+        The text is encoded and written in chunks, so a large note is never held twice in memory.
+
         Returns a dict with details: { "path": ..., "bytes_written": ..., "filename": ... }
         Raises LocalNoteStorageError on failures.
         """
-        try:
-            # Ensure directory exists
+        chunks = (content[start:start + _WRITE_CHUNK_CHARS] for start in range(0, len(content), _WRITE_CHUNK_CHARS))
+        return self._write_atomic(filename, lambda f: _write_encoded(f, chunks))
+
+    # PUBLIC_INTERFACE
+    def save_lines(self, filename: str, lines: Iterable[str]) -> dict:
+        """
+        Save lines (without newline terminators) joined by newlines as a .txt file in the base directory.
+
+        Lines are encoded and written as they are produced, e.g. straight from NoteGenerator.iter_note_lines,
+        so the full note text is never assembled in memory.
+
+        Returns a dict with details: { "path": ..., "bytes_written": ..., "filename": ... }
+        Raises LocalNoteStorageError on failures.
+        """
+        def chunks() -> Iterator[str]:
+            for i, line in enumerate(lines):
+                if i:
+                    yield "\n"
+                yield line
+
+        return self._write_atomic(filename, lambda f: _write_encoded(f, chunks()))
+
+    # PUBLIC_INTERFACE
+    def save_bytes(self, filename: str, data: bytes) -> dict:
+        """
+        Save already-encoded UTF-8 bytes as a .txt file in the base directory.
+
+        Returns a dict with details: { "path": ..., "bytes_written": ..., "filename": ... }
+        Raises LocalNoteStorageError on failures.
+        """
+        return self._write_atomic(filename, lambda f: f.write(data))
+
+    def _ensure_base_dir(self) -> None:
+        """Create the base directory once per process instead of on every save."""
+        if self.base_dir in LocalNoteStorage._VERIFIED_DIRS:
+            return
+        with LocalNoteStorage._VERIFIED_LOCK:
             os.makedirs(self.base_dir, exist_ok=True)
+            LocalNoteStorage._VERIFIED_DIRS.add(self.base_dir)
+
+    def _open_temp(self, target_path: str) -> Tuple[str, BinaryIO]:
+        """Open the temporary sibling of target_path for writing; returns (path, file).
+
+        If the base directory was removed after it was verified, it is recreated and the open retried once.
+        Nothing has been read from the caller's source yet at this point, so the retry is always safe.
+        The name is unique per call, so concurrent saves of the same note never write into each other's file.
+        """
+        prefix = os.path.basename(target_path) + "."
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, prefix=prefix, suffix=".part")
+        except FileNotFoundError:
+            LocalNoteStorage._VERIFIED_DIRS.discard(self.base_dir)
+            self._ensure_base_dir()
+            fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, prefix=prefix, suffix=".part")
+        try:
+            os.chmod(tmp_path, self._file_mode(target_path))
+        except OSError:
+            os.close(fd)
+            os.remove(tmp_path)
+            raise
+        return tmp_path, os.fdopen(fd, "wb", buffering=_WRITE_BUFFER_BYTES)
+
+    @staticmethod
+    def _file_mode(target_path: str) -> int:
+        """Permissions for a saved note: an existing note keeps its mode, a new one gets 0666 minus the umask."""
+        try:
+            return stat.S_IMODE(os.stat(target_path).st_mode)
+        except FileNotFoundError:
+            return 0o666 & ~_UMASK
+
+    def _write_and_replace(self, target_path: str, write: Callable[[BinaryIO], int]) -> int:
+        """Write to a temporary sibling of target_path and move it into place; returns bytes written.
+
+        The data is flushed to disk before the rename, so a sync client watching the folder sees one
+        complete file appear rather than a file growing through several partial uploads.
+        """
+        tmp_path, f = self._open_temp(target_path)
+        try:
+            with f:
+                bytes_written = write(f)
+                f.flush()
+                _fdatasync(f.fileno())
+            os.replace(tmp_path, target_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return bytes_written
+
+    def _write_atomic(self, filename: str, write: Callable[[BinaryIO], int]) -> dict:
+        """Run write() against a buffered temporary file, then move it over the target with os.replace.
+
+        Readers (including sync clients) therefore only ever see the old or the complete new file.
+        """
+        try:
+            self._ensure_base_dir()
 
             # Ensure .txt extension
             if not filename.lower().endswith(".txt"):
@@ -166,32 +441,197 @@ class LocalNoteStorage:
             safe_name = os.path.basename(filename)
             target_path = os.path.join(self.base_dir, safe_name)
 
-            data = content.encode("utf-8")
-            with open(target_path, "wb") as f:
-                f.write(data)
+            bytes_written = self._write_and_replace(target_path, write)
 
             return {
                 "path": target_path,
-                "bytes_written": len(data),
+                "bytes_written": bytes_written,
                 "filename": safe_name,
             }
-        except Exception as e:
+        except OSError as e:
+            # Only filesystem failures are storage errors; an exception from the caller's source (e.g. note
+            # generation feeding save_lines) propagates unchanged after the temporary file is removed.
             raise LocalNoteStorageError(f"Failed to save file locally: {e}") from e
 
+    # PUBLIC_INTERFACE
+    async def asave_text_file(self, filename: str, content: str) -> dict:
+        """
+        Async variant of save_text_file for use from async callers.
+
+        The blocking write runs on a dedicated note I/O thread pool so the event loop is not stalled on disk
+        I/O, and slow synced folders cannot exhaust the loop's default executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_IO_POOL, self.save_text_file, filename, content)
+
+
+# PUBLIC_INTERFACE
+class SummaryJobRunner:
+    """Runs note saves in the background, tracking progress on SummaryJob rows.
+
+    Two kinds of job: "summary" generates the note and saves it (generate_and_save_summary), "save" writes
+    note text the client already supplied (save_note_to_local). Jobs run on the note I/O thread pool, so the
+    HTTP worker returns as soon as the row is created. A save job's text is held in memory until it runs.
+    """
+
+    def __init__(
+        self,
+        generator: NoteGenerator | None = None,
+        storage: LocalNoteStorage | None = None,
+        executor: ThreadPoolExecutor | None = None,
+    ) -> None:
+        self.generator = generator or NoteGenerator()
+        self.storage = storage or LocalNoteStorage()
+        self.executor = executor or _IO_POOL
+
+    # PUBLIC_INTERFACE
+    def submit(self, conversation: Conversation, filename: str, note_title: str = "") -> SummaryJob:
+        """Create a pending summary job and queue it once the creating transaction commits."""
+        job = SummaryJob.objects.create(conversation=conversation, filename=filename, note_title=note_title)
+        self._queue(self.run, job.id)
+        return job
+
+    # PUBLIC_INTERFACE
+    def submit_save(self, conversation: Conversation, filename: str, content: str) -> SummaryJob:
+        """Create a pending job that saves the given note text, queued like submit."""
+        job = SummaryJob.objects.create(conversation=conversation, kind="save", filename=filename)
+        self._queue(self.run_save, job.id, content)
+        return job
+
+    # PUBLIC_INTERFACE
+    def run(self, job_id: uuid.UUID) -> None:
+        """Generate and save the note for a job, recording the save result or the error on the row."""
+        self._mark(job_id, "running")
+        try:
+            job = SummaryJob.objects.select_related("conversation").get(id=job_id)
+            title = self.generator.note_title(job.conversation, job.note_title)
+            result = self.storage.save_lines(
+                filename=job.filename, lines=self.generator.iter_note_lines(job.conversation, title)
+            )
+        except Exception as e:
+            logger.exception("Summary job %s failed", job_id)
+            self._mark(job_id, "failed", error=str(e))
+            return
+        self._mark(job_id, "succeeded", result={"note_title": title, "save_result": result})
+
+    # PUBLIC_INTERFACE
+    def run_save(self, job_id: uuid.UUID, content: str) -> None:
+        """Save the note text for a save job, recording the save result or the error on the row."""
+        self._mark(job_id, "running")
+        try:
+            filename = SummaryJob.objects.values_list("filename", flat=True).get(id=job_id)
+            result = self.storage.save_text_file(filename=filename, content=content)
+        except Exception as e:
+            logger.exception("Save job %s failed", job_id)
+            self._mark(job_id, "failed", error=str(e))
+            return
+        self._mark(job_id, "succeeded", result={"save_result": result})
+
+    @staticmethod
+    def _mark(job_id: uuid.UUID, status: str, **fields) -> None:
+        SummaryJob.objects.filter(id=job_id).update(status=status, updated_at=timezone.now(), **fields)
+
+    def _queue(self, fn: Callable, *args) -> None:
+        transaction.on_commit(lambda: self.executor.submit(self._run_in_worker, fn, *args))
+
+    def _run_in_worker(self, fn: Callable, *args) -> None:
+        # Pool threads live outside the request cycle, so release their DB connection when the job ends.
+        try:
+            fn(*args)
+        finally:
+            connections.close_all()
+
+
+# Opening question used when the patient has not said anything yet; no model call is needed for it.
+CANNED_OPENER = "What brings you in today? Please describe your main symptoms and when they started."
+
+# Follow-up prompts keep at least FOLLOW_UP_WINDOW recent messages verbatim; once the dialogue grows past
+# FOLLOW_UP_SUMMARY_AFTER messages, older turns are replaced by a running summary stored in metadata["intake"].
+FOLLOW_UP_WINDOW = 8
+FOLLOW_UP_SUMMARY_AFTER = 12
+
+
+def _summary_message(summary: str) -> dict:
+    """System message carrying the running summary of the turns left out of a follow-up prompt."""
+    return {"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"}
+
 
 # PUBLIC_INTERFACE
 class AIConversationHelper:
-    """Helper that uses AI to generate dynamic follow-up questions based on stored conversation."""
+    """Helper that uses AI to generate dynamic follow-up questions based on stored conversation.
+
+    Holds no mutable state, so one instance can be shared across threads. Repeat requests for an unchanged
+    conversation are answered by the follow-up response cache in the views.
+    """
 
     def __init__(self, ai: AIClient | None = None) -> None:
-        self.ai = ai or AIClient()
+        self.ai = ai or get_shared_client()
 
     # PUBLIC_INTERFACE
     def next_follow_up(self, conversation: Conversation) -> str:
         """Return the next follow-up question based on conversation context."""
-        messages = conversation.messages.all()
-        dialogue = []
-        for m in messages:
-            role = "user" if m.sender == "patient" else "assistant"
-            dialogue.append({"role": role, "content": m.text})
+        answer, dialogue = self._prepare(conversation)
+        if answer is not None:
+            return answer
         return self.ai.ask_follow_up(dialogue=dialogue)
+
+    # PUBLIC_INTERFACE
+    def stream_follow_up(self, conversation: Conversation) -> Iterator[str]:
+        """Yield the next follow-up question in text chunks as the AI produces them.
+
+        The canned opener arrives as a single chunk.
+        """
+        answer, dialogue = self._prepare(conversation)
+        if answer is not None:
+            yield answer
+            return
+        yield from self.ai.stream_follow_up(dialogue=dialogue)
+
+    def _prepare(self, conversation: Conversation):
+        """Return (answer, prompt dialogue); answer is set when no AI call is needed."""
+        dialogue = build_dialogue(conversation)
+        # Nothing from the patient yet: answer with the static opener instead of calling the AI.
+        if not any(d["role"] == "user" for d in dialogue):
+            return CANNED_OPENER, dialogue
+        if len(dialogue) > FOLLOW_UP_SUMMARY_AFTER:
+            dialogue = self._windowed_dialogue(conversation, dialogue)
+        return None, dialogue
+
+    def _windowed_dialogue(self, conversation: Conversation, dialogue: List[dict]) -> List[dict]:
+        """Replace older turns with a stored running summary so the prompt size stays bounded."""
+        intake = conversation.metadata.get("intake") or {}
+        summarized_upto = intake.get("summarized_upto", 0)
+        summary = intake.get("running_summary")
+        if not summary or len(dialogue) - summarized_upto > FOLLOW_UP_SUMMARY_AFTER:
+            upto = len(dialogue) - FOLLOW_UP_WINDOW
+            # Fold only the turns since the last summary into it, so each summarizer call stays small.
+            earlier = [_summary_message(summary)] if summary else []
+            try:
+                fresh = self.ai.summarize_dialogue(
+                    dialogue=earlier + dialogue[summarized_upto:upto], patient_id=conversation.patient_id
+                )
+            except Exception:
+                # Keep asking without a fresh summary: the stored one (if any) plus the recent window. Nothing
+                # is stored, so the next turn tries again from the same point.
+                return earlier + dialogue[-FOLLOW_UP_WINDOW:]
+            summary, summarized_upto = fresh, upto
+            conversation.metadata = self._store_running_summary(conversation.id, summary, summarized_upto)
+        return [_summary_message(summary)] + dialogue[summarized_upto:]
+
+    @staticmethod
+    def _store_running_summary(conversation_id: uuid.UUID, summary: str, summarized_upto: int) -> dict:
+        """Write the running summary into metadata["intake"] under a row lock; returns the stored metadata.
+
+        The metadata is re-read inside the lock, so other keys written since the conversation was loaded are kept.
+        """
+        with transaction.atomic():
+            metadata = (
+                Conversation.objects.select_for_update()
+                .values_list("metadata", flat=True)
+                .get(id=conversation_id)
+            ) or {}
+            intake = {**(metadata.get("intake") or {}), "running_summary": summary, "summarized_upto": summarized_upto}
+            metadata = {**metadata, "intake": intake}
+            Conversation.objects.filter(id=conversation_id).update(metadata=metadata)
+        return metadata
+
@@ -1,7 +1,14 @@
 from rest_framework.test import APITestCase
+from django.test import SimpleTestCase
 from django.urls import reverse
+from api import views
 from api.models import Conversation, Message
+import os
+import stat
+import tempfile
+import unittest
 import uuid
+from unittest import mock
 
 
 class HealthTests(APITestCase):
@@ -35,6 +42,33 @@ class SendMessageTests(APITestCase):
         self.assertFalse(res.data["data"]["created_new_conversation"])
         self.assertEqual(Message.objects.filter(conversation=convo).count(), 1)
 
+    def test_repeated_idempotency_key_replays_response_once(self):
+        payload = {"conversation_id": str(uuid.uuid4()), "sender": "patient", "text": "Retry me", "patient_id": "p13"}
+        first = self.client.post(self.send_url, data=payload, format="json", HTTP_IDEMPOTENCY_KEY="k-1")
+        second = self.client.post(self.send_url, data=payload, format="json", HTTP_IDEMPOTENCY_KEY="k-1")
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(Message.objects.filter(text="Retry me").count(), 1)
+
+    def test_idempotency_key_reused_with_different_body_is_rejected(self):
+        payload = {"conversation_id": str(uuid.uuid4()), "sender": "patient", "text": "First", "patient_id": "p15"}
+        self.client.post(self.send_url, data=payload, format="json", HTTP_IDEMPOTENCY_KEY="k-2")
+        res = self.client.post(
+            self.send_url, data={**payload, "text": "Second"}, format="json", HTTP_IDEMPOTENCY_KEY="k-2"
+        )
+        self.assertEqual(res.status_code, 422)
+        self.assertEqual(res.data["error"]["code"], "idempotency_key_reused")
+        self.assertFalse(Message.objects.filter(text="Second").exists())
+
+    def test_blank_or_overlong_idempotency_key_is_rejected(self):
+        payload = {"conversation_id": str(uuid.uuid4()), "sender": "patient", "text": "Keyed", "patient_id": "p17"}
+        for key in ("", "k" * 256):
+            res = self.client.post(self.send_url, data=payload, format="json", HTTP_IDEMPOTENCY_KEY=key)
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(res.data["error"]["code"], "invalid_idempotency_key")
+        self.assertFalse(Message.objects.filter(text="Keyed").exists())
+
     def test_send_message_create_if_missing_with_patient_id(self):
         # Non-existent conversation id
         missing_id = uuid.uuid4()
@@ -66,3 +100,427 @@ class SendMessageTests(APITestCase):
         self.assertEqual(res.data["status"], "error")
         self.assertEqual(res.data["error"]["code"], "not_found")
         self.assertIn("hint", res.data["error"]["details"])
+
+    def test_send_message_invalid_payload_reports_field_errors(self):
+        payload = {"conversation_id": "not-a-uuid", "sender": "doctor", "text": "  "}
+        res = self.client.post(self.send_url, data=payload, format="json")
+        self.assertEqual(res.status_code, 400)
+        details = res.data["error"]["details"]
+        self.assertEqual(details["conversation_id"], ["Must be a valid UUID."])
+        self.assertEqual(details["sender"], ['"doctor" is not a valid choice.'])
+        self.assertEqual(details["text"], ["This field may not be blank."])
+
+    def test_send_message_rejects_null_and_surrogate_characters(self):
+        convo_id = str(uuid.uuid4())
+        body = (
+            f'{{"conversation_id": "{convo_id}", "sender": "patient", "text": "a\\u0000b", "patient_id": "\\ud800x"}}'
+        )
+        res = self.client.post(self.send_url, data=body, content_type="application/json")
+        self.assertEqual(res.status_code, 400)
+        details = res.data["error"]["details"]
+        self.assertEqual(details["text"], ["Null characters are not allowed."])
+        self.assertEqual(details["text"][0].code, "null_characters_not_allowed")
+        self.assertEqual(details["patient_id"], ["Surrogate characters are not allowed: U+D800."])
+        self.assertEqual(details["patient_id"][0].code, "surrogate_characters_not_allowed")
+        self.assertFalse(Conversation.objects.filter(id=convo_id).exists())
+
+    def test_malformed_json_uses_error_envelope(self):
+        res = self.client.post(self.send_url, data="{not json", content_type="application/json")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["status"], "error")
+        self.assertEqual(res.data["error"]["code"], "parse_error")
+
+
+class ConversationStatusTests(APITestCase):
+    def test_status_by_path_uuid(self):
+        convo = Conversation.objects.create(patient_id="p9", metadata={})
+        Message.objects.create(conversation=convo, sender="patient", text="hi")
+        res = self.client.get(reverse('ConversationStatusById', args=[convo.id]))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["data"]["message_count"], 1)
+
+    def test_status_by_query_param(self):
+        convo = Conversation.objects.create(patient_id="p10", metadata={})
+        res = self.client.get(reverse('ConversationStatus'), {"conversation_id": str(convo.id)})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["data"]["patient_id"], "p10")
+
+    def test_matching_etag_returns_not_modified_until_conversation_changes(self):
+        convo = Conversation.objects.create(patient_id="p16", metadata={})
+        url = reverse('ConversationStatusById', args=[convo.id])
+        etag = self.client.get(url)["ETag"]
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b"")
+        self.client.post(
+            reverse('SendMessage'),
+            data={"conversation_id": str(convo.id), "sender": "patient", "text": "hi"},
+            format="json",
+        )
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_malformed_query_uuid_is_rejected_without_query(self):
+        with self.assertNumQueries(0):
+            res = self.client.get(reverse('ConversationStatus'), {"conversation_id": "not-a-uuid"})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["error"]["code"], "validation_error")
+
+
+class ContinueConversationTests(APITestCase):
+    def test_continue_appends_messages_in_order(self):
+        convo = Conversation.objects.create(patient_id="p5", metadata={})
+        before = convo.updated_at
+        payload = {
+            "conversation_id": str(convo.id),
+            "messages": [
+                {"conversation_id": str(convo.id), "sender": "patient", "text": f"line {i}"} for i in range(5)
+            ],
+        }
+        res = self.client.post(reverse('ContinueConversation'), data=payload, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["data"]["appended"], 5)
+        self.assertEqual(
+            list(convo.messages.values_list("text", flat=True)), [f"line {i}" for i in range(5)]
+        )
+        convo.refresh_from_db()
+        self.assertGreater(convo.updated_at, before)
+
+
+class NextFollowUpTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('NextFollowUp')
+
+    def test_empty_conversation_returns_canned_opener(self):
+        from api.services import CANNED_OPENER
+        convo = Conversation.objects.create(patient_id="p3", metadata={})
+        res = self.client.post(self.url, data={"conversation_id": str(convo.id)}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["data"]["question"], CANNED_OPENER)
+
+    def test_long_dialogue_is_summarized_once_and_windowed(self):
+        from api.services import AIConversationHelper, FOLLOW_UP_WINDOW
+
+        class RecordingAI:
+            def __init__(self):
+                self.summaries = 0
+                self.prompts = []
+
+            def summarize_dialogue(self, dialogue, patient_id):
+                self.summaries += 1
+                return "earlier turns"
+
+            def ask_follow_up(self, dialogue):
+                self.prompts.append(dialogue)
+                return "Any allergies?"
+
+        convo = Conversation.objects.create(patient_id="p4", metadata={})
+        for i in range(14):
+            Message.objects.create(conversation=convo, sender="patient" if i % 2 == 0 else "bot", text=f"m{i}")
+        ai = RecordingAI()
+        helper = AIConversationHelper(ai=ai)
+        helper.next_follow_up(convo)
+        helper.next_follow_up(Conversation.objects.get(id=convo.id))
+        self.assertEqual(ai.summaries, 1)
+        self.assertEqual(len(ai.prompts), 2)
+        self.assertEqual(ai.prompts[-1][0]["role"], "system")
+        self.assertEqual(len(ai.prompts[-1]), FOLLOW_UP_WINDOW + 1)
+        self.assertEqual(Conversation.objects.get(id=convo.id).metadata["intake"]["summarized_upto"], 6)
+
+    def test_resummary_folds_new_turns_and_keeps_other_metadata(self):
+        from api.services import AIConversationHelper
+
+        class RecordingAI:
+            def __init__(self):
+                self.summary_inputs = []
+
+            def summarize_dialogue(self, dialogue, patient_id):
+                self.summary_inputs.append(dialogue)
+                return "newer summary"
+
+            def ask_follow_up(self, dialogue):
+                return "Any allergies?"
+
+        intake = {"running_summary": "old summary", "summarized_upto": 2}
+        convo = Conversation.objects.create(patient_id="p18", metadata={"intake": intake})
+        for i in range(20):
+            Message.objects.create(conversation=convo, sender="patient" if i % 2 == 0 else "bot", text=f"m{i}")
+        # Written by another request after this copy of the conversation was loaded.
+        Conversation.objects.filter(id=convo.id).update(metadata={"intake": intake, "triage": "urgent"})
+        ai = RecordingAI()
+        AIConversationHelper(ai=ai).next_follow_up(convo)
+        summary_input = ai.summary_inputs[0]
+        self.assertIn("old summary", summary_input[0]["content"])
+        self.assertEqual([d["content"] for d in summary_input[1:]], [f"m{i}" for i in range(2, 12)])
+        metadata = Conversation.objects.get(id=convo.id).metadata
+        self.assertEqual(metadata["triage"], "urgent")
+        self.assertEqual(metadata["intake"], {"running_summary": "newer summary", "summarized_upto": 12})
+
+    def test_summarizer_failure_falls_back_to_recent_window(self):
+        from api.services import AIConversationHelper, FOLLOW_UP_WINDOW
+
+        class FailingSummaryAI:
+            def __init__(self):
+                self.prompts = []
+
+            def summarize_dialogue(self, dialogue, patient_id):
+                raise RuntimeError("provider down")
+
+            def ask_follow_up(self, dialogue):
+                self.prompts.append(dialogue)
+                return "Any fever?"
+
+        convo = Conversation.objects.create(patient_id="p9", metadata={})
+        for i in range(14):
+            Message.objects.create(conversation=convo, sender="patient" if i % 2 == 0 else "bot", text=f"m{i}")
+        ai = FailingSummaryAI()
+        helper = AIConversationHelper(ai=ai)
+        self.assertEqual(helper.next_follow_up(convo), "Any fever?")
+        self.assertEqual(len(ai.prompts[-1]), FOLLOW_UP_WINDOW)
+        self.assertEqual(ai.prompts[-1][-1]["content"], "m13")
+        self.assertEqual(Conversation.objects.get(id=convo.id).metadata, {})
+
+    def test_unchanged_conversation_reuses_question_until_new_message(self):
+        convo = Conversation.objects.create(patient_id="p9", metadata={})
+        Message.objects.create(conversation=convo, sender="patient", text="My back hurts")
+        with mock.patch.object(views._HELPER, "next_follow_up", return_value="Since when?") as ask:
+            for _ in range(2):
+                res = self.client.post(self.url, data={"conversation_id": str(convo.id)}, format="json")
+                self.assertEqual(res.data["data"]["question"], "Since when?")
+            self.assertEqual(ask.call_count, 1)
+            self.client.post(
+                reverse('SendMessage'),
+                data={"conversation_id": str(convo.id), "sender": "patient", "text": "Two days"},
+                format="json",
+            )
+            self.client.post(self.url, data={"conversation_id": str(convo.id)}, format="json")
+            self.assertEqual(ask.call_count, 2)
+
+
+class NextFollowUpStreamTests(APITestCase):
+    def test_streams_deltas_then_done_event(self):
+        convo = Conversation.objects.create(patient_id="p10", metadata={})
+        Message.objects.create(conversation=convo, sender="patient", text="I have a cough")
+        with mock.patch.object(views._HELPER, "stream_follow_up", return_value=iter(["Is it ", "dry?"])):
+            res = self.client.post(reverse('NextFollowUpStream'), data={"conversation_id": str(convo.id)}, format="json")
+            body = b"".join(res.streaming_content).decode()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Type"], "text/event-stream")
+        self.assertIn('data: {"delta": "Is it "}', body)
+        self.assertTrue(body.endswith(
+            f'event: done\ndata: {{"conversation_id": "{convo.id}", "question": "Is it dry?"}}\n\n'
+        ))
+
+
+class LocalNoteStorageTests(SimpleTestCase):
+    def test_save_text_file_writes_txt_atomically(self):
+        from api.services import LocalNoteStorage
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = LocalNoteStorage(base_dir=tmp)
+            result = storage.save_text_file("note", "Héllo")
+            self.assertEqual(result["filename"], "note.txt")
+            self.assertEqual(result["bytes_written"], len("Héllo".encode("utf-8")))
+            with open(os.path.join(tmp, "note.txt"), encoding="utf-8") as f:
+                self.assertEqual(f.read(), "Héllo")
+            self.assertEqual(os.listdir(tmp), ["note.txt"])
+
+    @unittest.skipIf(os.name == "nt", "POSIX permission bits")
+    def test_saved_note_gets_umask_mode_and_overwrite_keeps_existing_mode(self):
+        from api.services import LocalNoteStorage, _UMASK
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = LocalNoteStorage(base_dir=tmp)
+            path = storage.save_text_file("note", "v1")["path"]
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o666 & ~_UMASK)
+            os.chmod(path, 0o640)
+            storage.save_text_file("note", "v2")
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o640)
+
+    def test_save_lines_recreates_removed_directory_without_losing_lines(self):
+        from api.services import LocalNoteStorage
+        with tempfile.TemporaryDirectory() as tmp:
+            base = os.path.join(tmp, "notes")
+            storage = LocalNoteStorage(base_dir=base)
+            storage.save_text_file("first", "x")
+            os.remove(os.path.join(base, "first.txt"))
+            os.rmdir(base)
+            result = storage.save_lines("second", iter(["a", "b"]))
+            with open(result["path"], encoding="utf-8") as f:
+                self.assertEqual(f.read(), "a\nb")
+
+    def test_source_error_propagates_unwrapped_and_leaves_no_file(self):
+        from api.services import LocalNoteStorage
+
+        def lines():
+            yield "a"
+            raise RuntimeError("generation failed")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaisesMessage(RuntimeError, "generation failed"):
+                LocalNoteStorage(base_dir=tmp).save_lines("note", lines())
+            self.assertEqual(os.listdir(tmp), [])
+
+
+class GenerateNoteTests(APITestCase):
+    def test_repeat_request_reuses_note_until_title_changes(self):
+        convo = Conversation.objects.create(patient_id="p14", metadata={})
+        Message.objects.create(conversation=convo, sender="patient", text="Sore throat")
+        url = reverse('GenerateNote')
+        with mock.patch.object(views._NG, "generate_note", return_value=("T", "note body")) as gen:
+            for _ in range(2):
+                res = self.client.post(url, data={"conversation_id": str(convo.id)}, format="json")
+                self.assertEqual(res.data["data"]["note_text"], "note body")
+            self.assertEqual(gen.call_count, 1)
+            self.client.post(url, data={"conversation_id": str(convo.id), "note_title": "Other"}, format="json")
+            self.assertEqual(gen.call_count, 2)
+
+
+class NoteStreamTests(APITestCase):
+    def test_streamed_note_matches_and_memoizes_generated_note(self):
+        from api.services import NoteGenerator
+
+        class StreamingAI:
+            def stream_summary(self, dialogue, patient_id):
+                yield from ["  Chief", " Concern: cough", " \n"]
+
+            def summarize_dialogue(self, dialogue, patient_id):
+                raise AssertionError("summary should come from the streamed result")
+
+        convo = Conversation.objects.create(patient_id="p15", metadata={})
+        Message.objects.create(conversation=convo, sender="patient", text="Cough at night")
+        ng = NoteGenerator(ai=StreamingAI())
+        chunks = list(ng.stream_note(convo, "T"))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual("".join(chunks), ng.generate_note(convo, "T")[1])
+        self.assertTrue(chunks[0].endswith("Patient ID: p15\n\nChief"))
+
+    def test_empty_stream_falls_back_and_is_not_memoized(self):
+        from api.services import NoteGenerator
+
+        class EmptyThenAnsweringAI:
+            def stream_summary(self, dialogue, patient_id):
+                yield from ["", "  "]
+
+            def summarize_dialogue(self, dialogue, patient_id):
+                return "Chief Concern: cough"
+
+        convo = Conversation.objects.create(patient_id="p16", metadata={})
+        Message.objects.create(conversation=convo, sender="patient", text="Cough at night")
+        ng = NoteGenerator(ai=EmptyThenAnsweringAI())
+        self.assertIn("Chief Concerns:", "".join(ng.stream_note(convo, "T")))
+        self.assertTrue(ng.generate_note(convo, "T")[1].endswith("\n\nChief Concern: cough"))
+
+
+class NoteGeneratorFallbackTests(APITestCase):
+    def test_fallback_note_classifies_patient_lines(self):
+        from api.services import NoteGenerator
+
+        class FailingAI:
+            def summarize_dialogue(self, dialogue, patient_id):
+                raise RuntimeError("provider down")
+
+        convo = Conversation.objects.create(patient_id="p6", metadata={})
+        for sender, text in [
+            ("bot", "What brings you in?"),
+            ("patient", "I have a bad Headache for 3 days"),
+            ("patient", "It is getting worse"),
+            ("patient", "I took Ibuprofen"),
+            ("patient", "I am allergic to penicillin and worried"),
+        ]:
+            Message.objects.create(conversation=convo, sender=sender, text=text)
+        title, text = NoteGenerator(ai=FailingAI()).generate_note(convo)
+        self.assertEqual(title, "Disease Note for Patient p6")
+        self.assertIn("Reported Symptoms:\n- I have a bad Headache for 3 days\n", text)
+        self.assertIn("Duration:\n- I have a bad Headache for 3 days\n", text)
+        self.assertIn("Severity:\n- It is getting worse\n", text)
+        self.assertIn("Medications:\n- I took Ibuprofen\n", text)
+        self.assertIn("Allergies:\n- I am allergic to penicillin and worried\n", text)
+        self.assertIn("Chief Concerns:\n- I am allergic to penicillin and worried\n", text)
+        self.assertIn("Context (last bot prompts):\n- What brings you in?\n", text)
+
+
+class GenerateAndSaveSummaryTests(APITestCase):
+    def test_summary_is_streamed_to_local_file(self):
+        convo = Conversation.objects.create(patient_id="p11", metadata={})
+        Message.objects.create(conversation=convo, sender="patient", text="I have a cough")
+        with tempfile.TemporaryDirectory() as tmp:
+            with mock.patch.object(views._STORAGE, "base_dir", tmp):
+                res = self.client.post(
+                    reverse('GenerateAndSaveSummary'),
+                    data={"conversation_id": str(convo.id), "filename": "summary"},
+                    format="json",
+                )
+            self.assertEqual(res.status_code, 200)
+            result = res.data["data"]["save_result"]
+            self.assertEqual(result["filename"], "summary.txt")
+            with open(os.path.join(tmp, "summary.txt"), encoding="utf-8") as f:
+                saved = f.read()
+        self.assertTrue(saved.startswith("Title: Disease Note for Patient p11\n"))
+        self.assertEqual(result["bytes_written"], len(saved.encode("utf-8")))
+
+    def test_background_request_returns_job_that_completes(self):
+        convo = Conversation.objects.create(patient_id="p12", metadata={})
+        Message.objects.create(conversation=convo, sender="patient", text="Mild fever for a day")
+        with tempfile.TemporaryDirectory() as tmp:
+            with mock.patch.object(views._STORAGE, "base_dir", tmp), \
+                    mock.patch.object(views._JOBS, "executor") as executor:
+                with self.captureOnCommitCallbacks(execute=True):
+                    res = self.client.post(
+                        reverse('GenerateAndSaveSummary'),
+                        data={"conversation_id": str(convo.id), "filename": "bg", "background": True},
+                        format="json",
+                    )
+                self.assertEqual(res.status_code, 202)
+                self.assertEqual(res.data["data"]["status"], "pending")
+                job_id = res.data["data"]["job_id"]
+                # Run the queued job inline; the pool wrapper only adds DB connection cleanup.
+                executor.submit.assert_called_once()
+                _, job_fn, *job_args = executor.submit.call_args.args
+                job_fn(*job_args)
+            res = self.client.get(reverse('SummaryJobStatus', args=[job_id]))
+            self.assertEqual(res.data["data"]["status"], "succeeded")
+            self.assertEqual(res.data["data"]["result"]["save_result"]["filename"], "bg.txt")
+            self.assertTrue(os.path.exists(os.path.join(tmp, "bg.txt")))
+
+
+class SaveNoteToLocalTests(APITestCase):
+    def test_background_save_writes_file_and_reports_result(self):
+        convo = Conversation.objects.create(patient_id="p17", metadata={})
+        with tempfile.TemporaryDirectory() as tmp:
+            with mock.patch.object(views._STORAGE, "base_dir", tmp), \
+                    mock.patch.object(views._JOBS, "executor") as executor:
+                with self.captureOnCommitCallbacks(execute=True):
+                    res = self.client.post(
+                        reverse('SaveNoteToLocal'),
+                        data={"conversation_id": str(convo.id), "note_text": "Rx", "filename": "rx", "background": True},
+                        format="json",
+                    )
+                self.assertEqual(res.status_code, 202)
+                _, job_fn, *job_args = executor.submit.call_args.args
+                job_fn(*job_args)
+            res = self.client.get(reverse('SummaryJobStatus', args=[res.data["data"]["job_id"]]))
+            self.assertEqual(res.data["data"]["kind"], "save")
+            self.assertEqual(res.data["data"]["status"], "succeeded")
+            with open(os.path.join(tmp, "rx.txt"), encoding="utf-8") as f:
+                self.assertEqual(f.read(), "Rx")
+
+    def test_overlong_background_fields_are_rejected(self):
+        convo = Conversation.objects.create(patient_id="p19", metadata={})
+        for name, body in [
+            ('SaveNoteToLocal', {"note_text": "Rx", "filename": "f" * 256}),
+            ('GenerateAndSaveSummary', {"filename": "f" * 256, "note_title": "t" * 256}),
+        ]:
+            res = self.client.post(
+                reverse(name), data={"conversation_id": str(convo.id), "background": True, **body}, format="json"
+            )
+            self.assertEqual(res.status_code, 400)
+            self.assertIn("filename", res.data["error"]["details"])
+        self.assertIn("note_title", res.data["error"]["details"])
+        self.assertFalse(convo.summary_jobs.exists())
+
+    def test_job_for_missing_row_is_logged_not_raised(self):
+        with self.assertLogs("api.services", level="ERROR") as logs:
+            views._JOBS.run_save(uuid.uuid4(), "Rx")
+            views._JOBS.run(uuid.uuid4())
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("DoesNotExist", logs.output[0])
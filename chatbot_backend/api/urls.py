@@ -1,25 +1,45 @@
-from django.urls import path
+from django.urls import include, path
 from .views import (
     health,
     start_conversation,
     send_message,
     continue_conversation,
     generate_note,
+    generate_note_stream,
     save_note_to_local,
     conversation_status,
     next_follow_up,
+    next_follow_up_stream,
     generate_and_save_summary,
+    summary_job_status,
 )
 
+# Routes are grouped by prefix so the resolver matches the prefix once before scanning a group's patterns.
+conversation_patterns = [
+    path('start/', start_conversation, name='StartConversation'),
+    path('send/', send_message, name='SendMessage'),
+    path('continue/', continue_conversation, name='ContinueConversation'),
+    path('status/', conversation_status, name='ConversationStatus'),
+    path('<uuid:conversation_id>/status/', conversation_status, name='ConversationStatusById'),
+]
+
+note_patterns = [
+    path('generate/', generate_note, name='GenerateNote'),
+    path('generate/stream/', generate_note_stream, name='GenerateNoteStream'),
+    path('save-local/', save_note_to_local, name='SaveNoteToLocal'),
+]
+
+ai_patterns = [
+    path('next-follow-up/', next_follow_up, name='NextFollowUp'),
+    path('next-follow-up/stream/', next_follow_up_stream, name='NextFollowUpStream'),
+    path('generate-and-save-summary/', generate_and_save_summary, name='GenerateAndSaveSummary'),
+]
+
 urlpatterns = [
     path('health/', health, name='Health'),
-    path('conversations/start/', start_conversation, name='StartConversation'),
-    path('conversations/send/', send_message, name='SendMessage'),
-    path('conversations/continue/', continue_conversation, name='ContinueConversation'),
-    path('conversations/status/', conversation_status, name='ConversationStatus'),
+    path('conversations/', include(conversation_patterns)),
     # Notes and AI
-    path('notes/generate/', generate_note, name='GenerateNote'),
-    path('notes/save-local/', save_note_to_local, name='SaveNoteToLocal'),
-    path('ai/next-follow-up/', next_follow_up, name='NextFollowUp'),
-    path('ai/generate-and-save-summary/', generate_and_save_summary, name='GenerateAndSaveSummary'),
+    path('notes/', include(note_patterns)),
+    path('ai/', include(ai_patterns)),
+    path('jobs/<uuid:job_id>/', summary_job_status, name='SummaryJobStatus'),
 ]
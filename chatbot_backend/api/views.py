@@ -1,10 +1,21 @@
+import hashlib
+import json
+import operator
+import re
 from uuid import UUID
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.http import HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import parse_etags
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.views import exception_handler
 from rest_framework import status
 
 from .serializers import (
@@ -18,38 +29,103 @@ from .serializers import (
     NextFollowUpRequestSerializer,
     NextFollowUpResponseSerializer,
     GenerateAndSaveSummaryRequestSerializer,
+    SummaryJobStatusSerializer,
+    validate_message_payload,
+    validate_follow_up_payload,
 )
-from .models import Conversation
+from .ai import AIClientError
+from .models import Conversation, SummaryJob
 from .services import (
     ConversationManager,
     NoteGenerator,
     LocalNoteStorage,
     LocalNoteStorageError,
     AIConversationHelper,
+    SummaryJobRunner,
 )
 
+# Stateless service objects shared by all requests instead of being rebuilt per call.
+_CM = ConversationManager()
+_NG = NoteGenerator()
+_STORAGE = LocalNoteStorage()
+_HELPER = AIConversationHelper()
+_JOBS = SummaryJobRunner(generator=_NG, storage=_STORAGE)
+
+# Seconds a follow-up question is reused for an unchanged conversation (retries, double submits, reloads).
+# The key carries updated_at, so appending a message moves to a fresh key.
+FOLLOW_UP_RESPONSE_TTL = 300
+# Seconds a generate_note payload is reused for the same conversation state and title (polling, re-opened notes).
+NOTE_RESPONSE_TTL = 300
+
+# Seconds a send_message response is replayed for a repeated Idempotency-Key header (client retries).
+IDEMPOTENCY_TTL = 600
+# Longest Idempotency-Key header accepted; the value is hashed into the cache key, so this bounds the request only.
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+# Hyphenated or plain 32-hex UUIDs; matching strings always parse, so malformed IDs never raise inside UUID().
+_UUID_RE = re.compile(r"[0-9a-fA-F]{8}(-?)[0-9a-fA-F]{4}\1[0-9a-fA-F]{4}\1[0-9a-fA-F]{4}\1[0-9a-fA-F]{12}")
+
+# Conversation columns read by note generation (header, heuristic note, cache keys); skips the metadata JSON.
+_NOTE_FIELDS = ("id", "patient_id", "created_at", "updated_at")
+
+# (sender, text) pair from a validated message dict, extracted in C rather than per-item Python indexing.
+_SENDER_TEXT = operator.itemgetter("sender", "text")
+
+# Error details for send_message's 404, built once and shared read-only by every response that uses it.
+_SEND_NOT_FOUND_DETAILS = {
+    "hint": "Provide a valid existing conversation_id or include patient_id to create a new conversation automatically.",
+}
+
+
+def maybe_schema(**kwargs):
+    """swagger_auto_schema when settings.EXPOSE_SCHEMA is on; otherwise leave the view undecorated."""
+    if settings.EXPOSE_SCHEMA:
+        return swagger_auto_schema(**kwargs)
+    return lambda view: view
+
+
+# Constant envelope heads, merged into each payload rather than rebuilt per response.
+_OK_HEAD = {"status": "success", "theme": "ocean-professional"}
+_ERROR_HEAD = {"status": "error", "theme": "ocean-professional"}
+
 
 def ocean_ok(data: dict, status_code=status.HTTP_200_OK):
     """Ocean Professional styled success payload."""
-    return Response(
-        {"status": "success", "theme": "ocean-professional", "data": data},
-        status=status_code,
-    )
+    return Response({**_OK_HEAD, "data": data}, status=status_code)
 
 
 def ocean_error(message: str, code: str = "error", details: dict | None = None, status_code=status.HTTP_400_BAD_REQUEST):
     """Ocean Professional styled error payload."""
     return Response(
-        {
-            "status": "error",
-            "theme": "ocean-professional",
-            "error": {"code": code, "message": message, "details": details or {}},
-        },
+        {**_ERROR_HEAD, "error": {"code": code, "message": message, "details": details or {}}},
         status=status_code,
     )
 
 
-@swagger_auto_schema(
+# PUBLIC_INTERFACE
+def ocean_exception_handler(exc, context):
+    """DRF EXCEPTION_HANDLER that renders API exceptions in the Ocean Professional error envelope.
+
+    Validation errors (is_valid(raise_exception=True), the hand-written payload validators) get the same
+    "Invalid input" payload the views used to build inline; other API exceptions (malformed JSON, 405, ...)
+    use the exception's code and message. Non-API exceptions are left to Django, as DRF's default does.
+    """
+    response = exception_handler(exc, context)
+    if response is None:
+        return None
+    if isinstance(exc, ValidationError):
+        error = ocean_error("Invalid input", details=exc.detail, status_code=response.status_code)
+    else:
+        detail = exc.detail
+        code = getattr(detail, "code", None) or exc.default_code
+        error = ocean_error(str(detail), code=code, status_code=response.status_code)
+    # Keep headers DRF attached to the exception response (WWW-Authenticate, Retry-After).
+    for header, value in response.items():
+        error[header] = value
+    return error
+
+
+@maybe_schema(
     method="get",
     operation_id="health",
     operation_summary="Health check",
@@ -64,7 +140,7 @@ def health(request):
     return ocean_ok({"message": "Server is up!"})
 
 
-@swagger_auto_schema(
+@maybe_schema(
     method="post",
     operation_id="start_conversation",
     operation_summary="Start a new conversation",
@@ -78,11 +154,9 @@ def health(request):
 def start_conversation(request):
     """Start a new patient conversation."""
     serializer = StartConversationSerializer(data=request.data)
-    if not serializer.is_valid():
-        return ocean_error("Invalid input", details=serializer.errors, status_code=status.HTTP_400_BAD_REQUEST)
+    serializer.is_valid(raise_exception=True)
 
-    cm = ConversationManager()
-    convo = cm.start_conversation(serializer.validated_data["patient_id"], serializer.validated_data.get("metadata"))
+    convo = _CM.start_conversation(serializer.validated_data["patient_id"], serializer.validated_data.get("metadata"))
 
     return ocean_ok(
         {
@@ -95,7 +169,7 @@ def start_conversation(request):
     )
 
 
-@swagger_auto_schema(
+@maybe_schema(
     method="post",
     operation_id="send_message",
     operation_summary="Send a single message",
@@ -103,14 +177,28 @@ def start_conversation(request):
         "Appends a single message to an existing conversation. "
         "If the provided conversation_id does not match an existing conversation and a patient_id is provided in the body, "
         "a new conversation will be created for that patient and the message appended. "
-        "If conversation_id is invalid or not found and patient_id is not provided, a 404 error is returned."
+        "If conversation_id is invalid or not found and patient_id is not provided, a 404 error is returned. "
+        "Send an Idempotency-Key header to make retries safe: a repeated key within 10 minutes replays the first "
+        "successful response instead of appending the message again. Reusing a key with a different body "
+        "returns 422. Keys are remembered in the Django cache, which is per process unless CACHES points at a "
+        "shared backend such as Redis; with several workers, configure one or retries may append twice."
     ),
+    manual_parameters=[
+        openapi.Parameter(
+            "Idempotency-Key",
+            openapi.IN_HEADER,
+            description="Optional client-generated key identifying this send across retries (1-255 characters)",
+            type=openapi.TYPE_STRING,
+            required=False,
+        )
+    ],
     request_body=MessageSerializer,
     responses={
         200: openapi.Response("OK", schema=openapi.Schema(type=openapi.TYPE_OBJECT)),
         201: openapi.Response("Created (new conversation created and message appended)", schema=openapi.Schema(type=openapi.TYPE_OBJECT)),
-        400: openapi.Response("Validation Error"),
+        400: openapi.Response("Validation Error or invalid Idempotency-Key"),
         404: openapi.Response("Conversation Not Found"),
+        422: openapi.Response("Idempotency-Key reused with a different body"),
     },
     tags=["Conversations"],
 )
@@ -124,27 +212,48 @@ def send_message(request):
     - If conversation exists: append message.
     - If conversation does not exist and patient_id provided: create conversation then append message.
     - Otherwise: return 404 with guidance.
+    - A repeated Idempotency-Key header replays the first successful response without appending again;
+      the same key with a different body is rejected with 422.
     """
-    serializer = MessageSerializer(data=request.data)
-    if not serializer.is_valid():
-        return ocean_error("Invalid input", details=serializer.errors)
+    data = validate_message_payload(request.data)
 
-    cm = ConversationManager()
-    conversation_id = serializer.validated_data["conversation_id"]
-    sender = serializer.validated_data["sender"]
-    text = serializer.validated_data["text"]
-    patient_id = serializer.validated_data.get("patient_id")
+    conversation_id = data["conversation_id"]
+    sender = data["sender"]
+    text = data["text"]
+    patient_id = data.get("patient_id")
+
+    idem_key = request.headers.get("Idempotency-Key")
+    if idem_key is not None:
+        if not idem_key.strip() or len(idem_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            return ocean_error(
+                f"Idempotency-Key must be 1-{IDEMPOTENCY_KEY_MAX_LENGTH} characters",
+                code="invalid_idempotency_key",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        # Hash the client's value so the cache key stays short and backend-safe (memcached: 250 bytes, no spaces).
+        idem_key = "idem:send:" + hashlib.blake2b(idem_key.encode("utf-8"), digest_size=16).hexdigest()
+        fingerprint = hashlib.blake2b(
+            json.dumps([str(conversation_id), sender, text, patient_id]).encode("utf-8"), digest_size=16
+        ).hexdigest()
+        replay = cache.get(idem_key)
+        if replay is not None:
+            if replay[0] != fingerprint:
+                return ocean_error(
+                    "Idempotency-Key was already used with a different request body",
+                    code="idempotency_key_reused",
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            return Response(replay[2], status=replay[1])
 
     try:
-        cm.append_messages(conversation_id, [(sender, text)])
+        _CM.append_messages(conversation_id, [(sender, text)])
         created = False
         convo_id_str = str(conversation_id)
         status_code = status.HTTP_200_OK
     except Conversation.DoesNotExist:
         # Graceful handling: create if patient_id provided; else return detailed 404
         if patient_id:
-            convo = cm.start_conversation(patient_id=patient_id, metadata={})
-            cm.append_messages(convo.id, [(sender, text)])
+            convo = _CM.start_conversation(patient_id=patient_id, metadata={}, messages=[(sender, text)])
             created = True
             convo_id_str = str(convo.id)
             status_code = status.HTTP_201_CREATED
@@ -152,13 +261,11 @@ def send_message(request):
             return ocean_error(
                 "Conversation not found",
                 code="not_found",
-                details={
-                    "hint": "Provide a valid existing conversation_id or include patient_id to create a new conversation automatically.",
-                },
+                details=_SEND_NOT_FOUND_DETAILS,
                 status_code=status.HTTP_404_NOT_FOUND,
             )
 
-    return ocean_ok(
+    response = ocean_ok(
         {
             "conversation_id": convo_id_str,
             "appended": 1,
@@ -166,9 +273,12 @@ def send_message(request):
         },
         status_code=status_code,
     )
+    if idem_key:
+        cache.set(idem_key, (fingerprint, response.status_code, response.data), IDEMPOTENCY_TTL)
+    return response
 
 
-@swagger_auto_schema(
+@maybe_schema(
     method="post",
     operation_id="continue_conversation",
     operation_summary="Append multiple messages",
@@ -182,26 +292,24 @@ def send_message(request):
 def continue_conversation(request):
     """Append multiple messages to a conversation."""
     serializer = ContinueConversationSerializer(data=request.data)
-    if not serializer.is_valid():
-        return ocean_error("Invalid input", details=serializer.errors)
+    serializer.is_valid(raise_exception=True)
 
-    cm = ConversationManager()
     try:
-        msgs = [(m["sender"], m["text"]) for m in serializer.validated_data["messages"]]
-        cm.append_messages(serializer.validated_data["conversation_id"], msgs)
+        msgs = list(map(_SENDER_TEXT, serializer.validated_data["messages"]))
+        _CM.append_messages(serializer.validated_data["conversation_id"], msgs)
     except Conversation.DoesNotExist:
         return ocean_error("Conversation not found", code="not_found", status_code=status.HTTP_404_NOT_FOUND)
 
     return ocean_ok({"conversation_id": str(serializer.validated_data["conversation_id"]), "appended": len(msgs)})
 
 
-@swagger_auto_schema(
+@maybe_schema(
     method="post",
     operation_id="generate_note",
     operation_summary="Generate a disease note",
     operation_description="Generates a disease note based on a conversation's messages.",
     request_body=GenerateNoteRequestSerializer,
-    responses={200: openapi.Response("OK", schema=openapi.Schema(type=openapi.TYPE_OBJECT))},
+    responses={200: openapi.Response("OK", GenerateNoteResponseSerializer)},
     tags=["Notes"],
 )
 @api_view(["POST"])
@@ -209,65 +317,176 @@ def continue_conversation(request):
 def generate_note(request):
     """Generate a disease note from the conversation content."""
     serializer = GenerateNoteRequestSerializer(data=request.data)
-    if not serializer.is_valid():
-        return ocean_error("Invalid input", details=serializer.errors)
+    serializer.is_valid(raise_exception=True)
 
-    cm = ConversationManager()
-    ng = NoteGenerator()
     try:
-        convo = cm.get_conversation(serializer.validated_data["conversation_id"])
+        convo = _CM.get_conversation(serializer.validated_data["conversation_id"], fields=_NOTE_FIELDS)
     except Conversation.DoesNotExist:
         return ocean_error("Conversation not found", code="not_found", status_code=status.HTTP_404_NOT_FOUND)
 
-    title, note_text = ng.generate_note(convo, serializer.validated_data.get("note_title", ""))
-    resp = GenerateNoteResponseSerializer(
-        data={"conversation_id": str(convo.id), "note_title": title, "note_text": note_text}
-    )
-    resp.is_valid(raise_exception=True)
-    return ocean_ok(resp.data)
+    note_title = serializer.validated_data.get("note_title", "")
+    title_digest = hashlib.blake2b(note_title.encode("utf-8"), digest_size=8).hexdigest()
+    key = f"note:{convo.id}:{convo.updated_at.timestamp()}:{title_digest}"
+    payload = cache.get(key)
+    if payload is None:
+        title, note_text = _NG.generate_note(convo, note_title)
+        # Server-built values: the response serializer documents this shape in the schema but is not run over it.
+        payload = {"conversation_id": str(convo.id), "note_title": title, "note_text": note_text}
+        cache.set(key, payload, NOTE_RESPONSE_TTL)
+    return ocean_ok(payload)
 
 
-@swagger_auto_schema(
+@maybe_schema(
+    method="post",
+    operation_id="generate_note_stream",
+    operation_summary="Stream a disease note",
+    operation_description=(
+        "Streams the note as newline-delimited JSON while the AI summary is generated. "
+        "Each line is {delta}; the last line is {done: true, conversation_id, note_title}, "
+        "or {error} if generation fails mid-stream."
+    ),
+    request_body=GenerateNoteRequestSerializer,
+    responses={
+        200: openapi.Response("application/x-ndjson"),
+        400: openapi.Response("Validation Error"),
+        404: openapi.Response("Conversation Not Found"),
+    },
+    tags=["Notes"],
+)
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def generate_note_stream(request):
+    """Stream a disease note as newline-delimited JSON."""
+    serializer = GenerateNoteRequestSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    try:
+        convo = _CM.get_conversation(serializer.validated_data["conversation_id"], fields=_NOTE_FIELDS)
+    except Conversation.DoesNotExist:
+        return ocean_error("Conversation not found", code="not_found", status_code=status.HTTP_404_NOT_FOUND)
+
+    title = _NG.note_title(convo, serializer.validated_data.get("note_title", ""))
+
+    def lines():
+        try:
+            for chunk in _NG.stream_note(convo, title):
+                yield json.dumps({"delta": chunk}) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+            return
+        yield json.dumps({"done": True, "conversation_id": str(convo.id), "note_title": title}) + "\n"
+
+    response = StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@maybe_schema(
     method="post",
     operation_id="next_follow_up",
     operation_summary="AI: Get next follow-up question",
     operation_description="Returns a concise AI-generated follow-up question based on the conversation context.",
     request_body=NextFollowUpRequestSerializer,
-    responses={200: openapi.Response("OK", schema=openapi.Schema(type=openapi.TYPE_OBJECT))},
+    responses={200: openapi.Response("OK", NextFollowUpResponseSerializer)},
     tags=["AI"],
 )
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def next_follow_up(request):
     """Return an AI-generated follow-up question based on conversation context."""
-    serializer = NextFollowUpRequestSerializer(data=request.data)
-    if not serializer.is_valid():
-        return ocean_error("Invalid input", details=serializer.errors)
+    data = validate_follow_up_payload(request.data)
 
-    cm = ConversationManager()
-    helper = AIConversationHelper()
     try:
-        convo = cm.get_conversation(serializer.validated_data["conversation_id"])
-        question = helper.next_follow_up(convo)
-        resp = NextFollowUpResponseSerializer(
-            data={"conversation_id": str(convo.id), "question": question}
-        )
-        resp.is_valid(raise_exception=True)
-        return ocean_ok(resp.data)
+        convo = _CM.get_conversation(data["conversation_id"])
+        key = f"followup:{convo.id}:{convo.updated_at.timestamp()}"
+        question = cache.get(key)
+        if question is None:
+            question = _HELPER.next_follow_up(convo)
+            if question:
+                cache.set(key, question, FOLLOW_UP_RESPONSE_TTL)
+        if not question:
+            raise AIClientError("AI provider returned an empty question")
+        return ocean_ok({"conversation_id": str(convo.id), "question": question})
     except Conversation.DoesNotExist:
         return ocean_error("Conversation not found", code="not_found", status_code=status.HTTP_404_NOT_FOUND)
     except Exception as e:
         return ocean_error("AI follow-up generation failed", details={"detail": str(e)}, status_code=500)
 
 
-@swagger_auto_schema(
+def _sse(data: dict, event: str | None = None) -> str:
+    """Format one server-sent event."""
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data)}\n\n"
+
+
+@maybe_schema(
+    method="post",
+    operation_id="next_follow_up_stream",
+    operation_summary="AI: Stream the next follow-up question",
+    operation_description=(
+        "Streams the follow-up question as server-sent events while the AI generates it. "
+        "Each 'data' event carries {delta}; a final 'done' event carries the full {conversation_id, question}, "
+        "or an 'error' event carries {detail} if generation fails mid-stream."
+    ),
+    request_body=NextFollowUpRequestSerializer,
+    responses={
+        200: openapi.Response("text/event-stream"),
+        400: openapi.Response("Validation Error"),
+        404: openapi.Response("Conversation Not Found"),
+    },
+    tags=["AI"],
+)
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def next_follow_up_stream(request):
+    """Stream an AI-generated follow-up question as server-sent events."""
+    data = validate_follow_up_payload(request.data)
+
+    try:
+        convo = _CM.get_conversation(data["conversation_id"])
+    except Conversation.DoesNotExist:
+        return ocean_error("Conversation not found", code="not_found", status_code=status.HTTP_404_NOT_FOUND)
+
+    key = f"followup:{convo.id}:{convo.updated_at.timestamp()}"
+
+    def events():
+        question = cache.get(key)
+        try:
+            if question is None:
+                parts = []
+                for delta in _HELPER.stream_follow_up(convo):
+                    parts.append(delta)
+                    yield _sse({"delta": delta})
+                question = "".join(parts).strip()
+                if question:
+                    cache.set(key, question, FOLLOW_UP_RESPONSE_TTL)
+            else:
+                yield _sse({"delta": question})
+        except Exception as e:
+            yield _sse({"detail": str(e)}, event="error")
+            return
+        yield _sse({"conversation_id": str(convo.id), "question": question}, event="done")
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop reverse proxies (nginx) from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@maybe_schema(
     method="post",
     operation_id="generate_and_save_summary",
     operation_summary="AI: Generate and save clinical note",
-    operation_description="Generates an AI clinical note/summary from the conversation and saves it as a .txt file in the configured OneDrive directory.",
+    operation_description=(
+        "Generates an AI clinical note/summary from the conversation and saves it as a .txt file in the configured "
+        "OneDrive directory. With background=true, returns 202 with a job_id at once; poll /api/jobs/<job_id>/."
+    ),
     request_body=GenerateAndSaveSummaryRequestSerializer,
     responses={
         200: openapi.Response("OK", schema=openapi.Schema(type=openapi.TYPE_OBJECT)),
+        202: openapi.Response("Accepted (background job queued)", schema=openapi.Schema(type=openapi.TYPE_OBJECT)),
         400: openapi.Response("Bad Request"),
         404: openapi.Response("Not Found"),
         500: openapi.Response("Server Error"),
@@ -285,24 +504,34 @@ def generate_and_save_summary(request):
 
     Returns:
       - { conversation_id, note_title, save_result: { path, bytes_written, filename } }
+      - With background=true: 202 { job_id, conversation_id, status }
     """
     serializer = GenerateAndSaveSummaryRequestSerializer(data=request.data)
-    if not serializer.is_valid():
-        return ocean_error("Invalid input", details=serializer.errors)
-
-    cm = ConversationManager()
-    ng = NoteGenerator()
-    storage = LocalNoteStorage()
+    serializer.is_valid(raise_exception=True)
 
     try:
-        convo = cm.get_conversation(serializer.validated_data["conversation_id"])
+        convo = _CM.get_conversation(serializer.validated_data["conversation_id"], fields=_NOTE_FIELDS)
     except Conversation.DoesNotExist:
         return ocean_error("Conversation not found", code="not_found", status_code=status.HTTP_404_NOT_FOUND)
 
+    if serializer.validated_data["background"]:
+        job = _JOBS.submit(
+            convo,
+            filename=serializer.validated_data["filename"],
+            note_title=serializer.validated_data.get("note_title", ""),
+        )
+        return ocean_ok(
+            {"job_id": str(job.id), "conversation_id": str(convo.id), "status": job.status},
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
     try:
-        title, note_text = ng.generate_note(convo, serializer.validated_data.get("note_title", ""))
-        filename = serializer.validated_data["filename"]
-        result = storage.save_text_file(filename=filename, content=note_text)
+        title = _NG.note_title(convo, serializer.validated_data.get("note_title", ""))
+        # Stream the note's lines straight into the file rather than building the full text first.
+        result = _STORAGE.save_lines(
+            filename=serializer.validated_data["filename"],
+            lines=_NG.iter_note_lines(convo, title),
+        )
         return ocean_ok(
             {
                 "conversation_id": str(convo.id),
@@ -316,15 +545,58 @@ def generate_and_save_summary(request):
         return ocean_error("AI summary generation or save failed", details={"detail": str(e)}, status_code=500)
 
 
-@swagger_auto_schema(
+@maybe_schema(
+    method="get",
+    operation_id="summary_job_status",
+    operation_summary="Get background note job status",
+    operation_description=(
+        "Returns the status of a background generate-and-save or save-local job and, once finished, "
+        "its save result or error."
+    ),
+    responses={
+        200: openapi.Response("OK", schema=openapi.Schema(type=openapi.TYPE_OBJECT)),
+        404: openapi.Response("Not Found"),
+    },
+    tags=["AI"],
+)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def summary_job_status(request, job_id: UUID):
+    """Get the status of a background note job."""
+    try:
+        job = SummaryJob.objects.get(id=job_id)
+    except SummaryJob.DoesNotExist:
+        return ocean_error("Job not found", code="not_found", status_code=status.HTTP_404_NOT_FOUND)
+
+    payload = SummaryJobStatusSerializer(
+        {
+            "job_id": job.id,
+            "conversation_id": job.conversation_id,
+            "kind": job.kind,
+            "status": job.status,
+            "result": job.result,
+            "error": job.error,
+            "created_at": job.created_at,
+            "updated_at": job.updated_at,
+        }
+    ).data
+    return ocean_ok(payload)
+
+
+@maybe_schema(
     method="post",
     operation_id="save_note_to_local",
     operation_summary="Save a note to local disk",
-    operation_description="Saves a .txt file to the local folder C:\\Nilesh_TATA\\Prescription on the host machine.",
+    operation_description=(
+        "Saves a .txt file to the local folder C:\\Nilesh_TATA\\Prescription on the host machine. "
+        "With background=true, returns 202 with a job_id at once; poll /api/jobs/<job_id>/."
+    ),
     request_body=LocalSaveRequestSerializer,
     responses={
         200: openapi.Response("OK"),
+        202: openapi.Response("Accepted (background job queued)"),
         400: openapi.Response("Bad Request"),
+        404: openapi.Response("Conversation Not Found (background mode)"),
         500: openapi.Response("Server Error"),
     },
     tags=["Local Storage"],
@@ -337,14 +609,29 @@ def save_note_to_local(request):
     Returns:
       - On success: { path, bytes_written, filename }
       - On failure: error payload with details
+      - With background=true: 202 { job_id, conversation_id, status }
     """
     serializer = LocalSaveRequestSerializer(data=request.data)
-    if not serializer.is_valid():
-        return ocean_error("Invalid input", details=serializer.errors)
+    serializer.is_valid(raise_exception=True)
+
+    if serializer.validated_data["background"]:
+        # Background jobs are tracked against their conversation, so it has to exist.
+        try:
+            convo = _CM.get_conversation(serializer.validated_data["conversation_id"], fields=("id",))
+        except Conversation.DoesNotExist:
+            return ocean_error("Conversation not found", code="not_found", status_code=status.HTTP_404_NOT_FOUND)
+        job = _JOBS.submit_save(
+            convo,
+            filename=serializer.validated_data["filename"],
+            content=serializer.validated_data["note_text"],
+        )
+        return ocean_ok(
+            {"job_id": str(job.id), "conversation_id": str(convo.id), "status": job.status},
+            status_code=status.HTTP_202_ACCEPTED,
+        )
 
-    storage = LocalNoteStorage()
     try:
-        result = storage.save_text_file(
+        result = _STORAGE.save_text_file(
             filename=serializer.validated_data["filename"],
             content=serializer.validated_data["note_text"],
         )
@@ -355,42 +642,76 @@ def save_note_to_local(request):
         return ocean_error("Unexpected error while saving locally", details={"detail": str(e)}, status_code=500)
 
 
-@swagger_auto_schema(
+@maybe_schema(
     method="get",
     operation_id="conversation_status",
     operation_summary="Get conversation status",
-    operation_description="Fetch basic info about a conversation including message count.",
+    operation_description=(
+        "Fetch basic info about a conversation including message count. "
+        "The conversation ID may be given in the path (/conversations/<uuid>/status/) or as a query parameter. "
+        "Responses carry an ETag; send it back in If-None-Match to get 304 Not Modified while nothing changed."
+    ),
     manual_parameters=[
         openapi.Parameter(
             "conversation_id",
             openapi.IN_QUERY,
-            description="Conversation ID (UUID)",
+            description="Conversation ID (UUID), required when not given in the path",
             type=openapi.TYPE_STRING,
-            required=True,
+            required=False,
         )
     ],
-    responses={200: openapi.Response("OK", schema=openapi.Schema(type=openapi.TYPE_OBJECT))},
+    responses={
+        200: openapi.Response("OK", schema=openapi.Schema(type=openapi.TYPE_OBJECT)),
+        304: openapi.Response("Not Modified (If-None-Match matched the current ETag)"),
+        400: openapi.Response("Missing or malformed conversation_id"),
+        404: openapi.Response("Conversation Not Found"),
+    },
     tags=["Conversations"],
 )
 @api_view(["GET"])
 @permission_classes([AllowAny])
-def conversation_status(request):
-    """Get conversation info and message count."""
-    cid = request.query_params.get("conversation_id")
+def conversation_status(request, conversation_id: UUID | None = None):
+    """Get conversation info and message count.
+
+    conversation_id arrives already parsed from the <uuid:...> path converter, or is read from the query string.
+    """
+    cid = conversation_id or request.query_params.get("conversation_id")
     if not cid:
         return ocean_error("conversation_id is required", code="validation_error")
+    if isinstance(cid, UUID):
+        uid = cid
+    elif _UUID_RE.fullmatch(cid):
+        uid = UUID(cid)
+    else:
+        # Malformed ID: a client error, answered without touching the database.
+        return ocean_error("conversation_id must be a valid UUID", code="validation_error")
     try:
-        convo = Conversation.objects.get(id=UUID(cid))
-    except Exception:
+        # One query: only the serialized columns plus the message count.
+        convo = (
+            Conversation.objects.only("id", "patient_id", "created_at", "updated_at")
+            .annotate(num_messages=Count("messages"))
+            .get(id=uid)
+        )
+    except Conversation.DoesNotExist:
         return ocean_error("Conversation not found", code="not_found", status_code=status.HTTP_404_NOT_FOUND)
 
+    # Appends bump updated_at; the count also covers deletions, which do not.
+    etag = f'W/"{int(convo.updated_at.timestamp() * 1e6):x}-{convo.num_messages}"'
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in parse_etags(if_none_match)):
+        not_modified = HttpResponseNotModified()
+        not_modified["ETag"] = etag
+        return not_modified
+
     payload = ConversationStatusSerializer(
         {
             "conversation_id": str(convo.id),
             "patient_id": convo.patient_id,
             "created_at": convo.created_at,
             "updated_at": convo.updated_at,
-            "message_count": convo.message_count(),
+            "message_count": convo.num_messages,
         }
     ).data
-    return ocean_ok(payload)
+    response = ocean_ok(payload)
+    response["ETag"] = etag
+    return response
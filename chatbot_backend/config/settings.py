@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -132,6 +133,21 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'EXCEPTION_HANDLER': 'api.views.ocean_exception_handler',
+}
+
+# Attach per-view OpenAPI metadata (swagger_auto_schema) at import time and serve the live drf-yasg docs.
+# Defaults to DEBUG; production workers can set EXPOSE_SCHEMA=false to skip both and serve the pre-generated
+# schema file instead.
+EXPOSE_SCHEMA = os.getenv('EXPOSE_SCHEMA', str(DEBUG)).strip().lower() in ('1', 'true', 'yes')
+# Schema written by `manage.py generate_openapi` and served as /openapi.json when EXPOSE_SCHEMA is off.
+OPENAPI_SCHEMA_PATH = BASE_DIR / 'interfaces' / 'openapi.json'
+
 CORS_ALLOW_ALL_ORIGINS = True
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 USE_X_FORWARDED_HOST = True
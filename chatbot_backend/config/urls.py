@@ -14,7 +14,9 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
+from django.http import FileResponse, Http404
 from django.urls import path, include, re_path
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
@@ -61,8 +63,20 @@ def dynamic_schema_view(request, *args, **kwargs):
     )
     return view.with_ui('swagger', cache_timeout=0)(request)
 
-urlpatterns += [
-    re_path(r'^docs/$', dynamic_schema_view, name='schema-swagger-ui'),
-    re_path(r'^redoc/$', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-    re_path(r'^openapi\.json$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-]
\ No newline at end of file
+def static_schema_view(request):
+    # Serves the schema generated at build time (manage.py generate_openapi) when live docs are disabled.
+    try:
+        return FileResponse(open(settings.OPENAPI_SCHEMA_PATH, 'rb'), content_type='application/json')
+    except FileNotFoundError:
+        raise Http404("OpenAPI schema has not been generated")
+
+if settings.EXPOSE_SCHEMA:
+    urlpatterns += [
+        re_path(r'^docs/$', dynamic_schema_view, name='schema-swagger-ui'),
+        re_path(r'^redoc/$', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+        re_path(r'^openapi\.json$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
+    ]
+else:
+    urlpatterns += [
+        re_path(r'^openapi\.json$', static_schema_view, name='schema-json'),
+    ]
\ No newline at end of file